@@ -1,3 +1,6 @@
+import asyncio
+import collections
+import fnmatch
 import pathlib
 import re
 import time
@@ -20,7 +23,6 @@ import os
 # Rich library imports for beautiful terminal output
 from rich.console import Console
 from rich.panel import Panel
-from rich.markdown import Markdown
 from rich.status import Status
 from rich.prompt import Prompt
 from rich.syntax import Syntax
@@ -53,6 +55,53 @@ def is_path_allowed(file_path: str) -> bool:
     except Exception:
         return False
 
+# Directories find_file never descends into
+IGNORED_DIRS = {
+    ".git", ".hg", ".svn", "node_modules", "__pycache__",
+    ".venv", "venv", ".tox", ".nox", ".mypy_cache", ".pytest_cache", "site-packages",
+}
+
+def iter_matching_files(root: str, pattern: str, recursive: bool = True,
+                        max_depth: int = None, deadline: float = None):
+    """Yield paths under root whose name matches a glob pattern, shallowest first.
+    
+    Walks with os.scandir breadth-first, skipping IGNORED_DIRS, virtualenvs
+    (directories containing pyvenv.cfg) and symlinked directories. Stops
+    quietly once time.monotonic() passes deadline; the caller decides when
+    it has seen enough and simply stops iterating.
+    
+    Args:
+        root: Absolute directory to search
+        pattern: File name or glob pattern (e.g., "*.txt")
+        recursive: Whether to search subdirectories
+        max_depth: Deepest subdirectory level to search (None = no limit)
+        deadline: time.monotonic() value after which the walk stops
+    """
+    match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+    if not recursive:
+        max_depth = 0
+    pending = collections.deque([(root, 0)])
+    while pending:
+        if deadline is not None and time.monotonic() >= deadline:
+            return
+        directory, depth = pending.popleft()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue  # unreadable or vanished directory
+        if depth and any(entry.name == "pyvenv.cfg" for entry in entries):
+            continue
+        for entry in entries:
+            if match(os.path.normcase(entry.name)):
+                yield entry.path
+            if (max_depth is None or depth < max_depth) and entry.name not in IGNORED_DIRS:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, depth + 1))
+                except OSError:
+                    pass
+
 @tool(
     "find_file",
     parse_docstring=True,
@@ -64,7 +113,10 @@ def is_path_allowed(file_path: str) -> bool:
 def find_file(
     filename: str, 
     search_dir: str = ".",
-    recursive: bool = True
+    recursive: bool = True,
+    max_results: int = 50,
+    max_depth: int = None,
+    timeout: float = 10.0
 ) -> str:
     """Find files by name or pattern in a directory.
 
@@ -72,6 +124,9 @@ def find_file(
         filename (str): The file name or pattern to search for (e.g., "*.txt", "config.json").
         search_dir (str): The directory to search in. Defaults to current directory.
         recursive (bool): Whether to search subdirectories. Defaults to True.
+        max_results (int): Stop after this many matches. Defaults to 50.
+        max_depth (int): How many subdirectory levels to search. Defaults to no limit.
+        timeout (float): Time budget for the search in seconds. Defaults to 10.
 
     Returns:
         str: Comma-separated list of full paths to matching files, or "No files found" if empty.
@@ -90,25 +145,29 @@ def find_file(
     if not search_path.is_dir():
         raise ValueError(f"Path is not a directory: {search_path}")
     
-    # Search for matching files
+    # Search for matching files, showing each one as it is found
+    deadline = time.monotonic() + timeout
+    matches = []
     try:
-        if recursive:
-            # Recursive search using glob
-            matches = list(search_path.glob(f"**/{filename}"))
-        else:
-            # Non-recursive search
-            matches = list(search_path.glob(filename))
-        
-        if matches:
-            # Convert to absolute paths and return as comma-separated string
-            file_paths = [str(m.resolve()) for m in matches]
-            return ", ".join(file_paths)
-        else:
-            return f"No files found matching '{filename}' in {search_path}"
-    
+        for path in iter_matching_files(str(search_path), filename, recursive, max_depth, deadline):
+            console.print(f"   [green]•[/green] {path}", highlight=False)
+            matches.append(path)
+            if len(matches) >= max_results:
+                break
     except Exception as e:
         return f"Error during search: {str(e)}"
 
+    if len(matches) >= max_results:
+        note = f" (stopped after {max_results} results)"
+    elif time.monotonic() >= deadline:
+        note = f" (search stopped after {timeout:g}s; results may be incomplete)"
+    else:
+        note = ""
+
+    if matches:
+        return ", ".join(matches) + note
+    return f"No files found matching '{filename}' in {search_path}{note}"
+
 @tool(
     "read_file",
     parse_docstring=True,
@@ -228,33 +287,6 @@ def write_file(
 # RICH HELPER FUNCTIONS
 # =============================================================================
 
-def type_print(text: str, style: str = "white", speed: float = 0.005):
-    """Print text with typing effect character by character.
-    
-    Args:
-        text: The text to print
-        style: Rich style to apply (e.g., "bold cyan", "green")
-        speed: Delay between characters in seconds
-    """
-    for char in text:
-        console.print(char, end="", style=style)
-        time.sleep(speed)
-    console.print()  # New line at the end
-
-def render_markdown_response(text: str, speed: float = 0):
-    """Render response with optional typing effect for markdown.
-    
-    Args:
-        text: The text to render (supports markdown)
-        speed: Typing speed (0 for instant)
-    """
-    if speed > 0:
-        # Type out plain text with effects
-        type_print(text, style="white", speed=speed)
-    else:
-        # Instant markdown rendering
-        console.print(Markdown(text))
-
 def print_code_block(code: str, language: str = "python"):
     """Print code with syntax highlighting.
     
@@ -284,6 +316,69 @@ agent = create_agent(
     tools=[find_file,read_file,write_file],
 )
 
+# =============================================================================
+# STREAMING RESPONSE
+# =============================================================================
+
+async def stream_response(user_input: str, thread_id: str):
+    """Stream one agent turn: tokens as they arrive, tool calls as they run.
+    
+    Args:
+        user_input: The user's message
+        thread_id: Conversation thread to continue
+    """
+    start = time.perf_counter()
+    first_token = None
+    status = console.status("[bold cyan]🤖 Thinking...", spinner="dots")
+    status.start()
+    # The spinner is a Live display: it must be stopped before printing tokens
+    spinning = True
+    # Print the "Bot:" prefix before the first token of each model turn
+    needs_prefix = True
+
+    try:
+        async for event in agent.astream_events(
+            {"messages": [HumanMessage(user_input)]},
+            config={"configurable": {"thread_id": thread_id}},
+            version="v2"
+        ):
+            kind = event["event"]
+
+            # Display streaming tokens from the LLM
+            if kind == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                if content:
+                    if first_token is None:
+                        first_token = time.perf_counter() - start
+                    if spinning:
+                        status.stop()
+                        spinning = False
+                    if needs_prefix:
+                        console.print("\n[bold cyan]🤖 Bot:[/bold cyan] ", end="")
+                        needs_prefix = False
+                    console.print(content, end="", style="white", markup=False, highlight=False, soft_wrap=True)
+
+            # Show tool calls as they start and finish
+            elif kind == "on_tool_start":
+                status.stop()
+                console.print(f"\n\n[yellow]🔧 [Calling tool: {event['name']}][/yellow]")
+                status.update(f"[bold yellow]🔧 Running {event['name']}...")
+                status.start()
+                spinning = True
+
+            elif kind == "on_tool_end":
+                status.stop()
+                console.print(f"[green]✅ [Tool {event['name']} completed][/green]")
+                status.update("[bold cyan]🤖 Thinking...")
+                status.start()
+                needs_prefix = True
+    finally:
+        status.stop()
+
+    total = time.perf_counter() - start
+    ttft = f"{first_token:.2f}s" if first_token is not None else "n/a"
+    console.print(f"\n[dim]⏱ first token {ttft} · total {total:.2f}s[/dim]")
+
 # =============================================================================
 # ENHANCED CHAT LOOP WITH RICH UI
 # =============================================================================
@@ -291,12 +386,16 @@ agent = create_agent(
 # Thread ID for maintaining conversation history
 thread_id = "conversation_1"
 
+# One event loop for the whole chat: the model's async HTTP client keeps
+# pooled connections bound to the loop that opened them
+loop = asyncio.new_event_loop()
+
 # Display beautiful header
 console.print()
 console.print(Panel.fit(
     "[bold cyan]🤖 AI Assistant Chat Bot[/bold cyan]\n\n"
     "[dim]Features:[/dim]\n"
-    "  • Terminal-like typing effects\n"
+    "  • Live token streaming\n"
     "  • File operations (find, read, write)\n"
     "  • Conversation history\n\n"
     "[yellow]Type 'quit', 'exit', or 'bye' to end the conversation.[/yellow]",
@@ -323,20 +422,8 @@ while True:
     if not user_input:
         continue
     
-    # Create human message
-    human_msg = HumanMessage(user_input)
-    
-    # Show status while AI is thinking
-    with console.status("[bold cyan]🤖 Thinking...", spinner="dots"):
-        # Invoke agent with thread configuration to maintain history
-        result = agent.invoke(
-            {"messages": [human_msg]},
-            config={"configurable": {"thread_id": thread_id}}
-        )
-    
-    # Get and display the AI's response with typing effect
-    ai_response = result["messages"][-1].content
-    console.print("\n[bold cyan]🤖 Bot:[/bold cyan] ", end="")
-    type_print(ai_response, style="white", speed=0.005)
+    # Stream the response token by token, keeping history in the thread
+    loop.run_until_complete(stream_response(user_input, thread_id))
 
+loop.close()
 console.print("\n")
@@ -68,6 +68,8 @@ from langchain_openai import ChatOpenAI
 from langgraph.types import Command, interrupt
 from langgraph.graph import END, START, StateGraph
 
+from utils.replay import wrap_chat_model
+
 def read_email(state: EmailAgentState) -> EmailAgentState:
     # Placeholder – usually you'd parse HTML, attachments, etc.
     return {}
@@ -82,6 +84,10 @@ llm = ChatOpenAI(
     temperature=0.0, 
     api_key="11111111111111")
 
+# Set LLM_CASSETTE=<file> to record the model I/O on the first run and replay
+# it offline afterwards (see utils/replay.py)
+llm = wrap_chat_model(llm)
+
 def classify_intent(state: EmailAgentState) -> EmailAgentState:
     structured_llm = llm.with_structured_output(EmailClassification)
 
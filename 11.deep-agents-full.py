@@ -39,6 +39,8 @@ from langchain_mcp_adapters.client import MultiServerMCPClient
 from utils.file_tools import ls, read_file, write_file, write_file_to_disk
 from utils.research_tools import tavily_search, think_tool, get_today_str
 from utils.task_tool import _create_task_tool
+from utils.metrics import get_metrics_sink
+from utils.replay import install_research_cassette, tool_callbacks, wrap_chat_model
 
 llm = ChatOpenAI(
     model="qwen/qwen3-4b-2507", 
@@ -47,6 +49,15 @@ llm = ChatOpenAI(
     api_key="11111111111111"
 )
 
+# Set LLM_CASSETTE=<file> to record model, search and tool I/O on the first run
+# and replay it offline afterwards (see utils/replay.py)
+llm = wrap_chat_model(llm)
+install_research_cassette()
+
+# Search runs against Tavily by default. Set LOCAL_SEARCH_DIR to a directory of
+# markdown/HTML documents to run fully offline with the local BM25 backend
+# (see utils/search_backends.py).
+
 # Limits
 max_concurrent_research_units = 2
 max_researcher_iterations = 2
@@ -65,7 +76,9 @@ research_sub_agent = {
 
 # Create task tool to delegate tasks to sub-agents
 task_tool = _create_task_tool(
-    sub_agent_tools, [research_sub_agent], llm, DeepAgentState
+    sub_agent_tools, [research_sub_agent], llm, DeepAgentState,
+    max_concurrent=max_concurrent_research_units,
+    result_policy={"max_tokens": 1000},  # long findings go to task_result_*.md files
 )
 
 delegation_tools = [task_tool]
@@ -107,7 +120,8 @@ agent = create_agent(
 
 # "content": "Give me an overview of Model Context Protocol (MCP).",
 
-result = agent.invoke(
+# ainvoke lets parallel task() delegations run concurrently
+result = asyncio.run(agent.ainvoke(
     {
         "messages": [
             {
@@ -115,11 +129,15 @@ result = agent.invoke(
                 "content": "Give me an overview of Model Context Protocol (MCP).",
             }
         ],
-    }
-)
+    },
+    config={"callbacks": tool_callbacks()},
+))
 
 format_messages(result["messages"])
 
+# Per-stage timings of the research pipeline (p50/p95)
+print(get_metrics_sink().report())
+
 
 # async def main():
 #     # Connect to the mcp-time server
@@ -0,0 +1,114 @@
+"""
+Coordinator prompt-size profile for sub-agent result policies.
+
+Runs a coordinator that delegates several rounds of research to verbose
+sub-agents, using a scripted fake model so no LLM server is needed, and prints
+the size of every prompt the coordinator sends to its model: once with
+results returned verbatim and once with a result policy that offloads long
+results to virtual files. Prompt size drives prefill latency of every later
+coordinator turn.
+
+Usage:
+    python bench_coordinator_context.py [delegations_per_round] [rounds] [result_tokens]
+"""
+
+import sys
+
+from langchain.agents import create_agent
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from utils.file_tools import read_file
+from utils.state import DeepAgentState
+from utils.task_tool import _create_task_tool, estimate_tokens
+
+COORDINATOR_PROMPT = "You are the research coordinator."
+RESEARCHER_PROMPT = "You are a researcher."
+
+PARAGRAPH = (
+    "The study reports measurable gains across every benchmark it covers, "
+    "although the authors note that the evaluation set is small and that "
+    "results on proprietary workloads may differ from the public numbers. "
+)
+
+
+class ScriptedModel(BaseChatModel):
+    """Coordinator delegates `per_round` tasks for `rounds` turns; researchers answer verbosely."""
+
+    per_round: int = 3
+    rounds: int = 2
+    result_tokens: int = 3000
+    prompt_tokens: list[int] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if messages[0].content != COORDINATOR_PROMPT:
+            topic = messages[-1].content
+            paragraphs = max(1, self.result_tokens * 4 // len(PARAGRAPH))
+            answer = f"## Findings on {topic}\n\n" + "\n\n".join([PARAGRAPH] * paragraphs)
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(answer))])
+
+        self.prompt_tokens.append(sum(estimate_tokens(str(m.content)) for m in messages))
+        round_ = sum(1 for m in messages if m.type == "ai")
+        if round_ < self.rounds:
+            tool_calls = [
+                {
+                    "name": "task",
+                    "args": {"description": f"topic {round_}.{i}", "subagent_type": "research-agent"},
+                    "id": f"call_{round_}_{i}",
+                }
+                for i in range(self.per_round)
+            ]
+            message = AIMessage("", tool_calls=tool_calls)
+        else:
+            message = AIMessage("Final report.")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def profile(model: ScriptedModel, result_policy) -> list[int]:
+    model.prompt_tokens = []
+    task_tool = _create_task_tool(
+        [],
+        [{"name": "research-agent", "description": "Research sub-agent", "prompt": RESEARCHER_PROMPT}],
+        model,
+        DeepAgentState,
+        result_policy=result_policy,
+    )
+    agent = create_agent(
+        model,
+        tools=[task_tool, read_file],
+        system_prompt=COORDINATOR_PROMPT,
+        state_schema=DeepAgentState,
+    )
+    agent.invoke({"messages": [{"role": "user", "content": "Research the topics."}]})
+    return model.prompt_tokens
+
+
+def main():
+    per_round = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    result_tokens = int(sys.argv[3]) if len(sys.argv) > 3 else 3000
+
+    model = ScriptedModel(per_round=per_round, rounds=rounds, result_tokens=result_tokens)
+    verbatim = profile(model, None)
+    compressed = profile(model, {"max_tokens": 1000, "summary_tokens": 150})
+
+    print(
+        f"Coordinator prompt size (estimated tokens), {rounds} rounds of "
+        f"{per_round} delegations returning ~{result_tokens} tokens each\n"
+    )
+    print(f"{'turn':<8}{'verbatim':>12}{'offloaded':>12}")
+    for turn, (full, small) in enumerate(zip(verbatim, compressed), start=1):
+        print(f"{turn:<8}{full:>12,}{small:>12,}")
+    print(f"{'total':<8}{sum(verbatim):>12,}{sum(compressed):>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Import-time benchmark for the utils package.
+
+Measures, in fresh interpreters, how long it takes to import the utils modules
+used by each deep-agents script. For imports that include utils.research_tools,
+the "eager" column additionally builds the summarization model and Tavily
+client, which is what importing that module used to do at load time.
+Scripts that do not import it (09, 10) are unaffected either way.
+
+Usage:
+    python bench_import_time.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+SCRIPT_IMPORTS = {
+    "09.deep-agents-todo.py": "import utils.prompts, utils.state, utils.todo_tools",
+    "10.deep-agents-filesystem.py": "import utils.prompts, utils.state, utils.todo_tools, utils.file_tools",
+    "11.deep-agents-full.py": (
+        "import utils.prompts, utils.state, utils.todo_tools, utils.file_tools, "
+        "utils.research_tools, utils.task_tool"
+    ),
+    "utils.research_tools": "import utils.research_tools",
+}
+
+EAGER_INIT = (
+    "; from utils.research_tools import get_summarization_model, get_tavily_client"
+    "; get_summarization_model(); get_tavily_client()"
+)
+
+TIMER = "import time; _t = time.perf_counter(); {code}; print(time.perf_counter() - _t)"
+
+
+def time_import(code: str, runs: int) -> float:
+    """Return the median import time in milliseconds over fresh interpreters."""
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(code=code)],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "TAVILY_API_KEY": "benchmark"},
+        ).stdout
+        samples.append(float(output.strip().splitlines()[-1]) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(f"Median import time over {runs} fresh interpreters\n")
+    print(f"{'imports of':<32}{'lazy ms':>10}{'eager ms':>10}{'saved ms':>10}")
+    for name, code in SCRIPT_IMPORTS.items():
+        lazy = time_import(code, runs)
+        if "research_tools" not in code:
+            print(f"{name:<32}{lazy:>10.1f}{'-':>10}{'-':>10}")
+            continue
+        eager = time_import(code + EAGER_INIT, runs)
+        print(f"{name:<32}{lazy:>10.1f}{eager:>10.1f}{eager - lazy:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
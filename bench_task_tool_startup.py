@@ -0,0 +1,67 @@
+"""
+Startup benchmark for the task delegation tool.
+
+Compares building a task tool for several sub-agents when every sub-agent graph
+is compiled up front (the previous behaviour) against lazy compilation, and
+shows the cost of the first and repeated delegations to one sub-agent type.
+No model calls are made; only graph construction is timed.
+
+Usage:
+    python bench_task_tool_startup.py [num_subagents]
+"""
+
+import sys
+import time
+
+from langchain.agents import create_agent
+from langchain_openai import ChatOpenAI
+
+from utils.prompts import RESEARCHER_INSTRUCTIONS
+from utils.research_tools import get_today_str, tavily_search, think_tool
+from utils.state import DeepAgentState
+from utils.task_tool import _create_task_tool, get_compiled_agent
+
+
+def elapsed_ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    llm = ChatOpenAI(
+        model="qwen/qwen3-4b-2507",
+        base_url="http://127.0.0.1:1234/v1",
+        temperature=0.0,
+        api_key="11111111111111",
+    )
+    tools = [tavily_search, think_tool]
+    subagents = [
+        {
+            "name": f"research-agent-{i}",
+            "description": "Research sub-agent",
+            "prompt": RESEARCHER_INSTRUCTIONS.format(date=get_today_str()) + f"\nFocus area {i}.",
+            "tools": ["tavily_search", "think_tool"],
+        }
+        for i in range(count)
+    ]
+
+    eager = elapsed_ms(lambda: [
+        create_agent(llm, system_prompt=a["prompt"], tools=tools, state_schema=DeepAgentState)
+        for a in subagents
+    ])
+    lazy = elapsed_ms(lambda: _create_task_tool(tools, subagents, llm, DeepAgentState))
+    first = elapsed_ms(lambda: get_compiled_agent(subagents[0]["prompt"], tools, llm, DeepAgentState))
+    again = elapsed_ms(lambda: get_compiled_agent(subagents[0]["prompt"], tools, llm, DeepAgentState))
+
+    print(f"Task tool with {count} sub-agents")
+    print(f"  eager build (compile all):   {eager:8.1f} ms")
+    print(f"  lazy build:                  {lazy:8.1f} ms")
+    print(f"  first delegation (compile):  {first:8.1f} ms")
+    print(f"  repeat delegation (cached):  {again:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,8 @@ from rich.theme import Theme
 from rich.table import Table
 from rich.progress import track
 
+from utility import type_print
+
 # Initialize Rich console with custom theme
 custom_theme = Theme({
     "info": "cyan",
@@ -53,10 +55,8 @@ def demo_typing_effect():
     
     console.print("\n[bold]Typing effect:[/bold]")
     text = "This text appears character by character, like a terminal! ⌨️"
-    for char in text:
-        console.print(char, end="", style="bold green")
-        time.sleep(0.0005)
-    console.print("\n")
+    type_print(text, style="bold green", chars_per_second=60, console=console)
+    console.print()
 
 def demo_status_spinner():
     """Demonstrate status spinner"""
@@ -1,11 +1,17 @@
 """Utility functions for displaying messages and prompts in Jupyter notebooks."""
 
+import contextlib
 import json
+import time
 
-from rich.console import Console
+from langchain_core.messages import AIMessageChunk
+from rich.console import Console, Group
+from rich.live import Live
 from rich.panel import Panel
 from rich.text import Text
 
+from utils.tracing import JsonlTraceWriter
+
 console = Console()
 
 
@@ -44,20 +50,26 @@ def format_message_content(message):
     return "\n".join(parts)
 
 
+def message_panel(m, source=None):
+    """Build the Rich panel for one message, optionally labelled with its source graph."""
+    msg_type = m.__class__.__name__.replace("Message", "")
+    content = format_message_content(m)
+    suffix = f" · {source}" if source else ""
+
+    if msg_type == "Human":
+        return Panel(content, title=f"🧑 Human{suffix}", border_style="blue")
+    elif msg_type in ("AI", "AIChunk"):
+        return Panel(content, title=f"🤖 Assistant{suffix}", border_style="green")
+    elif msg_type == "Tool":
+        return Panel(content, title=f"🔧 Tool Output{suffix}", border_style="yellow")
+    else:
+        return Panel(content, title=f"📝 {msg_type}{suffix}", border_style="white")
+
+
 def format_messages(messages):
     """Format and display a list of messages with Rich formatting."""
     for m in messages:
-        msg_type = m.__class__.__name__.replace("Message", "")
-        content = format_message_content(m)
-
-        if msg_type == "Human":
-            console.print(Panel(content, title="🧑 Human", border_style="blue"))
-        elif msg_type == "Ai":
-            console.print(Panel(content, title="🤖 Assistant", border_style="green"))
-        elif msg_type == "Tool":
-            console.print(Panel(content, title="🔧 Tool Output", border_style="yellow"))
-        else:
-            console.print(Panel(content, title=f"📝 {msg_type}", border_style="white"))
+        console.print(message_panel(m))
 
 
 def format_message(messages):
@@ -93,26 +105,179 @@ def show_prompt(prompt_text: str, title: str = "Prompt", border_style: str = "bl
         )
     )
 
+
+def type_print(text: str, style: str | None = None, chars_per_second: float = 400,
+               fps: float = 60, console=console):
+    """Print text with a typing effect, one chunk per frame.
+
+    Each frame writes every character due by then at ``chars_per_second``, so a
+    long answer costs ``fps`` prints per second instead of one print and one
+    sleep per character. When output is not a terminal (piped, redirected,
+    Jupyter) or ``chars_per_second`` is 0, the text is printed at once.
+
+    Args:
+        text: The text to print
+        style: Rich style to apply (e.g., "bold cyan", "green")
+        chars_per_second: Target typing rate
+        fps: Frames (writes) per second
+        console: Console to print to
+    """
+    if not console.is_terminal or chars_per_second <= 0:
+        console.print(text, style=style, markup=False, highlight=False)
+        return
+
+    frame = 1 / fps
+    start = time.perf_counter()
+    written = 0
+    while written < len(text):
+        due = min(len(text), max(written + 1, int((time.perf_counter() - start) * chars_per_second)))
+        # soft_wrap: the terminal wraps, Rich does not know the cursor column between chunks
+        console.print(text[written:due], style=style, end="", markup=False, highlight=False, soft_wrap=True)
+        written = due
+        if written < len(text):
+            time.sleep(frame)
+    console.print()
+
+
+class LiveMessageRenderer:
+    """Incremental message renderer built on ``rich.live``.
+
+    Completed messages are printed once, above the live region, and skipped if
+    seen again (by message id). Messages that are still streaming are shown in
+    the live region and grow in place as tokens arrive, so each update costs
+    O(new content) instead of re-rendering the whole history.
+
+    Example:
+        with LiveMessageRenderer() as renderer:
+            renderer.add_token(chunk)          # streaming AIMessageChunk
+            renderer.add_messages([message])   # completed messages
+    """
+
+    def __init__(self, console=console, refresh_per_second: float = 12):
+        self.console = console
+        self.live = Live(
+            console=console, refresh_per_second=refresh_per_second, transient=True
+        )
+        self.seen = set()
+        self.streaming = {}  # message id -> (source, Text of the tokens so far)
+
+    def __enter__(self):
+        self.live.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        # Anything still streaming is final now
+        for source, text in self.streaming.values():
+            self.console.print(
+                Panel(text, title=f"🤖 Assistant · {source}" if source else "🤖 Assistant", border_style="green")
+            )
+        self.streaming.clear()
+        self.live.stop()
+
+    def _refresh_live(self):
+        self.live.update(Group(*(
+            Panel(text, title=f"🤖 Assistant · {source} (streaming)" if source else "🤖 Assistant (streaming)",
+                  border_style="dim green")
+            for source, text in self.streaming.values()
+        )))
+
+    def print(self, *objects, **kwargs):
+        """Print above the live region."""
+        self.console.print(*objects, **kwargs)
+
+    def add_token(self, chunk, source=None):
+        """Append a streamed chunk's text to its message in the live region."""
+        if not isinstance(chunk.content, str) or not chunk.content or chunk.id in self.seen:
+            return
+        if chunk.id not in self.streaming:
+            self.streaming[chunk.id] = (source, Text())
+        self.streaming[chunk.id][1].append(chunk.content)
+        self._refresh_live()
+
+    def add_messages(self, messages, source=None):
+        """Print messages that have not been printed yet."""
+        for m in messages:
+            if m.id is not None:
+                if m.id in self.seen:
+                    continue
+                self.seen.add(m.id)
+                if self.streaming.pop(m.id, None) is not None:
+                    self._refresh_live()
+            self.console.print(message_panel(m, source))
+
+
+def _graph_label(namespace, delegations):
+    """Name a stream namespace: root, a labelled delegation, or the raw namespace."""
+    if not namespace:
+        return "root"
+    for depth in range(len(namespace), 0, -1):
+        if namespace[:depth] in delegations:
+            return delegations[namespace[:depth]]
+    return "/".join(namespace)
+
+
 # more expressive runner
-async def stream_agent(agent, query, config=None):
-    async for graph_name, stream_mode, event in agent.astream(
-        query,
-        stream_mode=["updates", "values"], 
-        subgraphs=True,
-        config=config
-    ):
-        if stream_mode == "updates":
-            print(f'Graph: {graph_name if len(graph_name) > 0 else "root"}')
-            
-            node, result = list(event.items())[0]
-            print(f'Node: {node}')
-            
-            for key in result.keys():
-                if "messages" in key:
-                    # print(f"Messages key: {key}")
-                    format_messages(result[key])
-                    break
-        elif stream_mode == "values":
-            current_state = event
+async def stream_agent(agent, query, config=None, trace_path=None, headless=False):
+    """Stream an agent run, rendering coordinator and sub-agent progress live.
+
+    Sub-agent node updates and tokens arrive under one namespace per delegation;
+    the task tool's "delegation" custom events are used to label them. Output
+    goes through a LiveMessageRenderer, so streamed tokens update in place and
+    each message is printed once.
+
+    Args:
+        agent: Compiled agent graph
+        query: Input state
+        config: Run config
+        trace_path: If given, every (namespace, mode, event) tuple except state
+            snapshots is appended to this file as JSONL by a background thread
+        headless: Skip Rich rendering entirely (e.g. in production with tracing)
+
+    Returns:
+        The final state of the root graph
+    """
+    delegations = {}
+    current_state = None
+    tracer = JsonlTraceWriter(trace_path) if trace_path else None
+    renderer = None if headless else LiveMessageRenderer()
+
+    try:
+        with renderer or contextlib.nullcontext():
+            async for graph_name, stream_mode, event in agent.astream(
+                query,
+                stream_mode=["updates", "messages", "custom", "values"],
+                subgraphs=True,
+                config=config
+            ):
+                if stream_mode == "values":
+                    if not graph_name:
+                        current_state = event
+                    continue
+                if tracer is not None:
+                    tracer.write(graph_name, stream_mode, event)
+                if renderer is None:
+                    continue
+
+                source = _graph_label(graph_name, delegations) if graph_name else None
+                if stream_mode == "messages":
+                    chunk, _ = event
+                    if isinstance(chunk, AIMessageChunk):
+                        renderer.add_token(chunk, source)
+                elif stream_mode == "custom" and "delegation" in event:
+                    delegation = event["delegation"]
+                    label = f"{delegation['subagent_type']} ({delegation['tool_call_id']})"
+                    delegations[tuple(delegation["namespace"])] = label
+                    renderer.print(f"[bold cyan]↳ Delegating to {label}:[/bold cyan] {delegation['description']}")
+                elif stream_mode == "updates":
+                    node, result = list(event.items())[0]
+                    renderer.print(f"Graph: {source or 'root'} · Node: {node}", markup=False, highlight=False)
+
+                    for key in (result or {}).keys():
+                        if "messages" in key:
+                            renderer.add_messages(result[key], source)
+                            break
+    finally:
+        if tracer is not None:
+            tracer.close()
 
     return current_state
@@ -0,0 +1,93 @@
+"""Near-duplicate detection for fetched web content.
+
+This module provides SimHash fingerprints so that mirrored or syndicated copies
+of the same article can be recognized before they are summarized and stored
+in the virtual file system a second time.
+"""
+
+import hashlib
+import re
+
+# Number of bits in a SimHash fingerprint
+FINGERPRINT_BITS = 64
+
+# Fingerprints within this Hamming distance are treated as the same document
+MAX_HAMMING_DISTANCE = 3
+
+# Words per shingle; larger shingles are less sensitive to boilerplate overlap
+SHINGLE_SIZE = 3
+
+# Documents shorter than this (in words) are too small to fingerprint reliably
+MIN_WORDS = 20
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _hash_shingle(shingle: str) -> int:
+    """Hash a shingle to a stable 64-bit integer."""
+    return int.from_bytes(
+        hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def simhash(text: str) -> str | None:
+    """Compute a 64-bit SimHash fingerprint of the given text.
+
+    Args:
+        text: Document text (markdown or plain text)
+
+    Returns:
+        Fingerprint as a 16 character hex string, or None if the text is too short
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < MIN_WORDS:
+        return None
+
+    weights = [0] * FINGERPRINT_BITS
+    for i in range(len(words) - SHINGLE_SIZE + 1):
+        h = _hash_shingle(" ".join(words[i : i + SHINGLE_SIZE]))
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+
+    return f"{fingerprint:016x}"
+
+
+def hamming_distance(left: str, right: str) -> int:
+    """Count differing bits between two hex fingerprints."""
+    return (int(left, 16) ^ int(right, 16)).bit_count()
+
+
+def find_near_duplicate(
+    fingerprint: str | None,
+    index: dict[str, str],
+    max_distance: int = MAX_HAMMING_DISTANCE,
+) -> str | None:
+    """Look up a fingerprint in an index of previously seen documents.
+
+    Args:
+        fingerprint: Fingerprint of the candidate document
+        index: Mapping of fingerprint to the filename it was stored under
+        max_distance: Maximum Hamming distance to consider a match
+
+    Returns:
+        Filename of the closest near-duplicate, or None if there is no match
+    """
+    if fingerprint is None or not index:
+        return None
+
+    # Exact matches are the common case for mirrored pages
+    if fingerprint in index:
+        return index[fingerprint]
+
+    best_filename, best_distance = None, max_distance + 1
+    for known, filename in index.items():
+        distance = hamming_distance(fingerprint, known)
+        if distance < best_distance:
+            best_filename, best_distance = filename, distance
+
+    return best_filename
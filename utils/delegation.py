@@ -0,0 +1,194 @@
+"""Scheduling of nested sub-agent delegations.
+
+Sub-agents that are allowed to delegate receive the task tool themselves, so
+work can be broken down hierarchically. DelegationScheduler is shared by every
+level of such a hierarchy and enforces:
+- max_depth: how many levels of delegation are allowed below the coordinator
+- max_concurrent_agents: how many sub-agents, across all levels, may run at once
+  (counted separately for sync delegations and for each event loop, see
+  DelegationScheduler)
+
+An agent that is waiting for its own sub-agents gives its slot back until the
+last of them finishes, so a full hierarchy cannot deadlock on its own slots.
+The current depth and slot are tracked in context variables, which LangGraph
+propagates into tool calls (threads and tasks alike).
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import threading
+import weakref
+
+# Depth of the agent running in the current context (0 = coordinator)
+_delegation_depth: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "delegation_depth", default=0
+)
+# Slot held by the sub-agent running in the current context
+_current_lease: contextvars.ContextVar["_Lease | None"] = contextvars.ContextVar(
+    "delegation_lease", default=None
+)
+
+
+class DelegationDepthExceeded(Exception):
+    """Raised when a delegation would exceed the scheduler's max_depth."""
+
+
+class _Lease:
+    """A running sub-agent's slot, released while it waits on its own sub-agents.
+
+    Several sibling sub-agents may be waited on at once, so the slot is released
+    when the first starts waiting and re-acquired when the last has finished.
+    """
+
+    def __init__(self, slots):
+        self.slots = slots
+        self.held = slots is not None
+        self.waiting = 0
+        self.acquiring = False
+        self._lock = threading.Lock()
+
+    def suspend(self) -> None:
+        with self._lock:
+            self.waiting += 1
+            release, self.held = self.held, False
+        if release:
+            self.slots.release()
+
+    def _start_resume(self) -> bool:
+        with self._lock:
+            self.waiting -= 1
+            if self.slots is None or self.waiting or self.held or self.acquiring:
+                return False
+            self.acquiring = True
+            return True
+
+    def _finish_resume(self) -> bool:
+        with self._lock:
+            self.acquiring = False
+            # Keep the slot only if no new sub-agent started waiting meanwhile
+            self.held = not self.waiting
+            return self.held
+
+    def resume(self) -> None:
+        if self._start_resume():
+            self.slots.acquire()
+            if not self._finish_resume():
+                self.slots.release()
+
+    async def aresume(self) -> None:
+        if self._start_resume():
+            await self.slots.acquire()
+            if not self._finish_resume():
+                self.slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            release, self.held = self.held, False
+        if release:
+            self.slots.release()
+
+
+class DelegationScheduler:
+    """Global limits for a hierarchy of delegating sub-agents.
+
+    Slots are held in one pool for sync delegations (``invoke``) and one per
+    event loop for async ones (``ainvoke``), since a thread semaphore cannot be
+    awaited and an asyncio one cannot be shared across loops. The limit is
+    exact for a hierarchy run in one mode; mixing sync and async runs, or
+    running on several loops, allows up to max_concurrent_agents in each.
+
+    Args:
+        max_depth: Levels of delegation allowed below the coordinator
+            (1 = sub-agents cannot delegate further)
+        max_concurrent_agents: Sub-agents running at once across all levels,
+            per mode and per event loop (default: no limit)
+    """
+
+    def __init__(self, max_depth: int = 2, max_concurrent_agents: int | None = None):
+        self.max_depth = max_depth
+        self.max_concurrent_agents = max_concurrent_agents
+        self._thread_slots = (
+            threading.BoundedSemaphore(max_concurrent_agents) if max_concurrent_agents else None
+        )
+        self._loop_slots = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def current_depth() -> int:
+        """Depth of the agent running in the current context (0 = coordinator)."""
+        return _delegation_depth.get()
+
+    def can_delegate(self) -> bool:
+        """Whether the agent in the current context may start a sub-agent."""
+        return self.current_depth() < self.max_depth
+
+    def _async_slots(self) -> asyncio.Semaphore | None:
+        if not self.max_concurrent_agents:
+            return None
+        loop = asyncio.get_running_loop()
+        if loop not in self._loop_slots:
+            self._loop_slots[loop] = asyncio.Semaphore(self.max_concurrent_agents)
+        return self._loop_slots[loop]
+
+    def _check_depth(self) -> int:
+        depth = self.current_depth()
+        if depth >= self.max_depth:
+            raise DelegationDepthExceeded(
+                f"Delegation depth limit of {self.max_depth} reached"
+            )
+        return depth
+
+    @contextlib.contextmanager
+    def delegate(self):
+        """Run a sub-agent within the limits (sync).
+
+        Raises:
+            DelegationDepthExceeded: If the current agent is already at max_depth
+        """
+        depth = self._check_depth()
+        parent = _current_lease.get()
+        if parent is not None:
+            parent.suspend()
+        try:
+            if self._thread_slots is not None:
+                self._thread_slots.acquire()
+            lease = _Lease(self._thread_slots)
+            lease_token = _current_lease.set(lease)
+            depth_token = _delegation_depth.set(depth + 1)
+            try:
+                yield
+            finally:
+                _delegation_depth.reset(depth_token)
+                _current_lease.reset(lease_token)
+                lease.close()
+        finally:
+            if parent is not None:
+                parent.resume()
+
+    @contextlib.asynccontextmanager
+    async def adelegate(self):
+        """Run a sub-agent within the limits (async).
+
+        Raises:
+            DelegationDepthExceeded: If the current agent is already at max_depth
+        """
+        depth = self._check_depth()
+        slots = self._async_slots()
+        parent = _current_lease.get()
+        if parent is not None:
+            parent.suspend()
+        try:
+            if slots is not None:
+                await slots.acquire()
+            lease = _Lease(slots)
+            lease_token = _current_lease.set(lease)
+            depth_token = _delegation_depth.set(depth + 1)
+            try:
+                yield
+            finally:
+                _delegation_depth.reset(depth_token)
+                _current_lease.reset(lease_token)
+                lease.close()
+        finally:
+            if parent is not None:
+                await parent.aresume()
@@ -0,0 +1,405 @@
+"""OpenAI-compatible fake model server for offline and load testing.
+
+Stands in for the LM Studio endpoint the scripts point ``ChatOpenAI(base_url=...)``
+at, so agent-side throughput and overhead can be measured without a GPU.
+Supports:
+- POST /v1/chat/completions, streamed (SSE) or not, with tool calls and
+  structured output (``response_format`` JSON schema or a forced tool call)
+- GET /v1/models
+- Configurable time to first token, tokens per second and concurrency limit
+  (requests over the limit wait for a slot, as on a local server)
+- Scripted responses: the first rule whose regex matches the latest message
+  decides the reply (``"role": "user"`` restricts a rule to user messages)
+
+Responses without a matching rule are generated: a forced tool call or JSON
+schema gets schema-valid placeholder arguments, anything else gets filler text.
+
+Run in-process:
+
+    with FakeOpenAIServer(tokens_per_second=200, max_concurrency=2) as server:
+        llm = ChatOpenAI(model="fake", base_url=server.base_url, api_key="x")
+
+or as a subprocess on the default LM Studio port:
+
+    python -m utils.fake_openai_server --port 1234 --rules rules.json
+
+Rules file format (JSON list):
+
+    [{"match": "charged twice", "response": {"json": {"intent": "billing", ...}}},
+     {"match": "(?i)overview", "response": "Scripted answer text"},
+     {"match": "search", "response": {"tool_calls": [{"name": "tavily_search", "arguments": {"query": "MCP"}}]}}]
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FILLER = (
+    "This is a placeholder response from the fake model server. It stands in "
+    "for a local model so agent overhead can be measured without a GPU."
+)
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _text_of(content) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+def placeholder_for_schema(schema: dict, defs: dict | None = None):
+    """Return a value that satisfies a JSON schema, using placeholder data."""
+    defs = defs if defs is not None else schema.get("$defs", schema.get("definitions", {}))
+    if "$ref" in schema:
+        return placeholder_for_schema(defs.get(schema["$ref"].rsplit("/", 1)[-1], {}), defs)
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [s for s in schema[key] if s.get("type") != "null"] or schema[key]
+            return placeholder_for_schema(options[0], defs)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "const" in schema:
+        return schema["const"]
+    if "default" in schema:
+        return schema["default"]
+
+    kind = schema.get("type", "object" if "properties" in schema else "string")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "string")
+    if kind == "object":
+        return {
+            name: placeholder_for_schema(prop, defs)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [placeholder_for_schema(schema.get("items", {}), defs)]
+    if kind == "integer":
+        return 0
+    if kind == "number":
+        return 0.0
+    if kind == "boolean":
+        return False
+    return "placeholder"
+
+
+class FakeOpenAIServer:
+    """In-process fake OpenAI-compatible server.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        latency: Seconds before the first token of every response
+        tokens_per_second: Generation speed; 0 returns all tokens at once
+        max_concurrency: Requests generated at once; others wait (default: no limit)
+        response_tokens: Length of generated filler responses
+        rules: Scripted responses, see the module docstring
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        tokens_per_second: float = 0.0,
+        max_concurrency: int | None = None,
+        response_tokens: int = 40,
+        rules: list[dict] | None = None,
+    ):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.max_concurrency = max_concurrency
+        self.response_tokens = response_tokens
+        self.rules = [dict(rule, pattern=re.compile(rule["match"])) for rule in rules or []]
+        self.stats = {"requests": 0, "active": 0, "peak_active": 0, "completion_tokens": 0}
+        self._stats_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        """Serve requests from a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve requests on the calling thread until interrupted."""
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # -- responses ---------------------------------------------------------
+
+    def _rule_for(self, messages: list[dict]) -> dict | None:
+        if not messages:
+            return None
+        latest = messages[-1]
+        # A tool result is the latest message after a scripted tool call, so the
+        # rule that triggered it no longer matches and the agent loop can end
+        for rule in self.rules:
+            if rule.get("role") not in (None, latest.get("role")):
+                continue
+            if rule["pattern"].search(_text_of(latest.get("content"))):
+                return rule
+        return None
+
+    def _forced_tool(self, request: dict) -> dict | None:
+        tool_choice = request.get("tool_choice")
+        tools = request.get("tools") or []
+        if isinstance(tool_choice, dict):
+            name = tool_choice.get("function", {}).get("name")
+            return next((t for t in tools if t["function"]["name"] == name), None)
+        if tool_choice in ("required", "any") and tools:
+            return tools[0]
+        return None
+
+    def build_reply(self, request: dict) -> dict:
+        """Return ``{"content": str | None, "tool_calls": [...]}`` for a request."""
+        messages = request.get("messages", [])
+        rule = self._rule_for(messages)
+        if rule is not None:
+            response = rule["response"]
+            if isinstance(response, str):
+                return {"content": response, "tool_calls": []}
+            if "json" in response:
+                return {"content": json.dumps(response["json"]), "tool_calls": []}
+            if "tool_calls" in response:
+                return {"content": response.get("content"), "tool_calls": response["tool_calls"]}
+            return {"content": response.get("content", ""), "tool_calls": []}
+
+        if (tool := self._forced_tool(request)) is not None:
+            function = tool["function"]
+            arguments = placeholder_for_schema(function.get("parameters", {}))
+            return {"content": None, "tool_calls": [{"name": function["name"], "arguments": arguments}]}
+
+        response_format = request.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            schema = response_format.get("json_schema", {}).get("schema", {})
+            return {"content": json.dumps(placeholder_for_schema(schema)), "tool_calls": []}
+        if response_format.get("type") == "json_object":
+            return {"content": "{}", "tool_calls": []}
+
+        words = (FILLER.split() * (self.response_tokens // len(FILLER.split()) + 1))[: self.response_tokens]
+        return {"content": " ".join(words), "tool_calls": []}
+
+    def _timing(self, rule_or_none: dict | None) -> tuple[float, float]:
+        rule = rule_or_none or {}
+        return rule.get("latency", self.latency), rule.get("tokens_per_second", self.tokens_per_second)
+
+    # -- HTTP --------------------------------------------------------------
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, body: dict):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self._send_json(200, {
+                        "object": "list",
+                        "data": [{"id": "fake-model", "object": "model", "owned_by": "fake"}],
+                    })
+                else:
+                    self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._send_json(400, {"error": {"message": "Invalid JSON body"}})
+                    return
+                server._complete(self, request)
+
+        return Handler
+
+    def _track(self, delta: int, completion_tokens: int = 0) -> None:
+        with self._stats_lock:
+            self.stats["active"] += delta
+            self.stats["peak_active"] = max(self.stats["peak_active"], self.stats["active"])
+            if delta > 0:
+                self.stats["requests"] += 1
+            self.stats["completion_tokens"] += completion_tokens
+
+    def _complete(self, handler, request: dict) -> None:
+        if self._slots is not None:
+            self._slots.acquire()
+        self._track(+1)
+        try:
+            reply = self.build_reply(request)
+            latency, tokens_per_second = self._timing(self._rule_for(request.get("messages", [])))
+            if request.get("stream"):
+                self._stream(handler, request, reply, latency, tokens_per_second)
+            else:
+                self._respond(handler, request, reply, latency, tokens_per_second)
+        finally:
+            self._track(-1)
+            if self._slots is not None:
+                self._slots.release()
+
+    @staticmethod
+    def _tool_calls(reply: dict) -> list[dict]:
+        return [
+            {
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+                "type": "function",
+                "function": {"name": call["name"], "arguments": json.dumps(call.get("arguments", {}))},
+            }
+            for call in reply["tool_calls"]
+        ]
+
+    @staticmethod
+    def _usage(request: dict, completion_tokens: int) -> dict:
+        prompt_tokens = sum(_estimate_tokens(_text_of(m.get("content"))) for m in request.get("messages", []))
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    def _respond(self, handler, request, reply, latency, tokens_per_second) -> None:
+        tool_calls = self._tool_calls(reply)
+        text = reply["content"] or ""
+        completion_tokens = _estimate_tokens(text + "".join(c["function"]["arguments"] for c in tool_calls))
+        time.sleep(latency + (completion_tokens / tokens_per_second if tokens_per_second else 0.0))
+        self._track(0, completion_tokens)
+
+        message = {"role": "assistant", "content": reply["content"]}
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        handler._send_json(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake-model"),
+            "choices": [{
+                "index": 0,
+                "message": message,
+                "finish_reason": "tool_calls" if tool_calls else "stop",
+            }],
+            "usage": self._usage(request, completion_tokens),
+        })
+
+    def _stream(self, handler, request, reply, latency, tokens_per_second) -> None:
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        model = request.get("model", "fake-model")
+
+        def send(delta: dict, finish_reason=None, usage=None):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [] if usage else [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            if usage:
+                chunk["usage"] = usage
+            data = f"data: {json.dumps(chunk)}\n\n".encode("utf-8")
+            handler.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            handler.wfile.flush()
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Cache-Control", "no-cache")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+
+        time.sleep(latency)
+        send({"role": "assistant", "content": ""})
+
+        completion_tokens = 0
+        text = reply["content"] or ""
+        # Stream roughly one token (word piece) per chunk
+        for token in re.findall(r"\S+\s*|\s+", text):
+            if tokens_per_second:
+                time.sleep(1.0 / tokens_per_second)
+            send({"content": token})
+            completion_tokens += 1
+
+        tool_calls = self._tool_calls(reply)
+        for index, call in enumerate(tool_calls):
+            send({"tool_calls": [{"index": index, **call}]})
+            completion_tokens += _estimate_tokens(call["function"]["arguments"])
+
+        self._track(0, completion_tokens)
+        send({}, finish_reason="tool_calls" if tool_calls else "stop")
+        if (request.get("stream_options") or {}).get("include_usage"):
+            send({}, usage=self._usage(request, completion_tokens))
+        done = b"data: [DONE]\n\n"
+        handler.wfile.write(f"{len(done):x}\r\n".encode("ascii") + done + b"\r\n0\r\n\r\n")
+        handler.wfile.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible fake model server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1234)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="0 = instant")
+    parser.add_argument("--max-concurrency", type=int, default=None)
+    parser.add_argument("--response-tokens", type=int, default=40)
+    parser.add_argument("--rules", help="JSON file of scripted responses")
+    args = parser.parse_args()
+
+    rules = None
+    if args.rules:
+        with open(args.rules, encoding="utf-8") as f:
+            rules = json.load(f)
+
+    server = FakeOpenAIServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        max_concurrency=args.max_concurrency,
+        response_tokens=args.response_tokens,
+        rules=rules,
+    )
+    print(f"Fake OpenAI server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Conflict-aware merging of virtual file updates.
+
+Concurrent sub-agents can write the same virtual file. Instead of a plain
+string, the task tool sends a versioned FileUpdate that carries the content the
+writer started from (its base). When file_reducer applies an update whose base
+no longer matches the current content, the update's merge policy decides what
+happens:
+- "reject": keep the current content and drop the update
+- "rename": keep the current content and store the update under a new name
+- "merge": three-way line merge; overlapping edits get conflict markers
+
+Conflicts are appended to the CONFLICTS_FILE virtual file.
+"""
+
+import difflib
+import pathlib
+from typing import Literal, NotRequired
+from typing_extensions import TypedDict
+
+MergePolicy = Literal["reject", "rename", "merge"]
+
+# Virtual file where unresolved write conflicts are reported
+CONFLICTS_FILE = "file_conflicts.md"
+
+
+class FileUpdate(TypedDict):
+    """A versioned write to a virtual file.
+
+    Attributes:
+        content: New content of the file
+        base: Content the writer started from, or None if it created the file
+        policy: What to do if the file changed since ``base``
+        source: Who wrote the update, used in conflict reports
+    """
+
+    content: str
+    base: str | None
+    policy: MergePolicy
+    source: NotRequired[str]
+
+
+def _hunks(base: list[str], other: list[str], side: str) -> list[tuple[int, int, list[str], str]]:
+    """Return (base start, base end, replacement lines, side) for each change."""
+    matcher = difflib.SequenceMatcher(None, base, other, autojunk=False)
+    return [
+        (i1, i2, other[j1:j2], side)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def _apply(base: list[str], hunks: list, start: int, end: int) -> list[str]:
+    """Apply one side's hunks to base[start:end]."""
+    lines, pos = [], start
+    for hunk_start, hunk_end, replacement, _ in hunks:
+        lines.extend(base[pos:hunk_start])
+        lines.extend(replacement)
+        pos = hunk_end
+    lines.extend(base[pos:end])
+    return lines
+
+
+def _terminated(lines: list[str]) -> list[str]:
+    if lines and not lines[-1].endswith("\n"):
+        return lines[:-1] + [lines[-1] + "\n"]
+    return lines
+
+
+def three_way_merge(base: str, current: str, incoming: str) -> tuple[str, bool]:
+    """Merge two edits of the same base text line by line.
+
+    Changes made by only one side are applied; identical changes are applied
+    once. Overlapping or adjacent changes that differ are kept side by side
+    between conflict markers.
+
+    Returns:
+        Tuple of (merged text, whether the merge was clean)
+    """
+    base_lines = base.splitlines(keepends=True)
+    hunks = sorted(
+        _hunks(base_lines, current.splitlines(keepends=True), "current")
+        + _hunks(base_lines, incoming.splitlines(keepends=True), "incoming"),
+        key=lambda h: (h[0], h[1]),
+    )
+
+    # Group hunks that overlap or touch in the base text
+    groups = []
+    for hunk in hunks:
+        if groups and hunk[0] <= groups[-1][1]:
+            group = groups[-1]
+            group[1] = max(group[1], hunk[1])
+            group[2].append(hunk)
+        else:
+            groups.append([hunk[0], hunk[1], [hunk]])
+
+    merged, clean, pos = [], True, 0
+    for start, end, group in groups:
+        merged.extend(base_lines[pos:start])
+        current_lines = _apply(base_lines, [h for h in group if h[3] == "current"], start, end)
+        incoming_lines = _apply(base_lines, [h for h in group if h[3] == "incoming"], start, end)
+        if len({h[3] for h in group}) == 1 or current_lines == incoming_lines:
+            merged.extend(current_lines if group[0][3] == "current" else incoming_lines)
+        else:
+            clean = False
+            merged = _terminated(merged)
+            merged.append("<<<<<<< current\n")
+            merged.extend(_terminated(current_lines))
+            merged.append("=======\n")
+            merged.extend(_terminated(incoming_lines))
+            merged.append(">>>>>>> incoming\n")
+        pos = end
+    merged.extend(base_lines[pos:])
+    return "".join(merged), clean
+
+
+def _renamed(files: dict[str, str], file_path: str) -> str:
+    path = pathlib.PurePosixPath(file_path)
+    n = 1
+    while (candidate := str(path.with_name(f"{path.stem}.conflict-{n}{path.suffix}"))) in files:
+        n += 1
+    return candidate
+
+
+def apply_file_update(files: dict[str, str], file_path: str, update: FileUpdate) -> str | None:
+    """Apply a versioned update to a files dict in place.
+
+    Returns:
+        A one-line conflict report, or None if the update applied cleanly
+    """
+    current = files.get(file_path)
+    content = update["content"]
+    if current is None or current == update["base"] or current == content:
+        files[file_path] = content
+        return None
+
+    source = update.get("source", "a concurrent writer")
+    policy = update["policy"]
+    if policy == "reject":
+        return f"- `{file_path}`: rejected the update from {source}; the file changed since it was read"
+    if policy == "rename":
+        renamed = _renamed(files, file_path)
+        files[renamed] = content
+        return f"- `{file_path}`: kept the current version; the update from {source} was saved as `{renamed}`"
+
+    merged, clean = three_way_merge(update["base"] or "", current, content)
+    files[file_path] = merged
+    if clean:
+        return None
+    return f"- `{file_path}`: merged the update from {source} with conflict markers; resolve them by rewriting the file"
@@ -17,6 +17,7 @@ from utils.prompts import (
     WRITE_FILE_DESCRIPTION,
     WRITE_FILE_TO_DISK_DESCRIPTION,
 )
+from utils.raw_store import materialize_raw_content, raw_content_line
 from utils.state import DeepAgentState
 
 
@@ -52,6 +53,11 @@ def read_file(
     if not content:
         return "System reminder: File exists but has empty contents"
 
+    # Raw page content is kept out of state; load it only if the read reaches it
+    marker_line = raw_content_line(content)
+    if marker_line is not None and offset + limit > marker_line:
+        content = materialize_raw_content(content)
+
     lines = content.splitlines()
     start_idx = offset
     end_idx = min(start_idx + limit, len(lines))
@@ -0,0 +1,192 @@
+"""Stage-level timing metrics for the research pipeline.
+
+This module records how long each pipeline stage takes (search API call, URL
+fetch, markdown conversion, summarization, state update) and how many bytes it
+handled, through a pluggable sink:
+- InMemoryMetricsSink: keeps recent samples and reports p50/p95 per stage (default)
+- JsonlMetricsSink: appends one JSON line per sample to a file
+- PrometheusMetricsSink: in-memory samples rendered in Prometheus text format
+"""
+
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class MetricsSink(ABC):
+    """Destination for stage timing samples."""
+
+    @abstractmethod
+    def record(self, stage: str, seconds: float, nbytes: int = 0, **labels) -> None:
+        """Record one timing sample for a pipeline stage.
+
+        Args:
+            stage: Stage name (e.g. "search_api", "url_fetch", "summarize")
+            seconds: Wall-clock duration of the stage
+            nbytes: Number of bytes the stage produced or consumed
+            **labels: Extra dimensions such as the search backend name
+        """
+
+    @abstractmethod
+    def summary(self) -> dict[str, dict]:
+        """Return count, p50, p95 and total bytes per stage."""
+
+    def report(self) -> str:
+        """Return p50/p95 per stage as a plain-text table."""
+        return format_report(self.summary())
+
+
+def summarize_samples(samples: dict[str, list[tuple[float, int]]]) -> dict[str, dict]:
+    """Compute per-stage statistics from (seconds, bytes) samples."""
+    summary = {}
+    for stage, values in sorted(samples.items()):
+        if not values:
+            continue
+        seconds = np.array([v[0] for v in values])
+        summary[stage] = {
+            "count": len(values),
+            "p50": float(np.percentile(seconds, 50)),
+            "p95": float(np.percentile(seconds, 95)),
+            "total_seconds": float(seconds.sum()),
+            "total_bytes": int(sum(v[1] for v in values)),
+        }
+    return summary
+
+
+def format_report(summary: dict[str, dict]) -> str:
+    """Format a stage summary as a plain-text table."""
+    lines = [f"{'stage':<18}{'count':>7}{'p50 ms':>11}{'p95 ms':>11}{'bytes':>14}"]
+    for stage, stats in summary.items():
+        lines.append(
+            f"{stage:<18}{stats['count']:>7}{stats['p50'] * 1000:>11.1f}"
+            f"{stats['p95'] * 1000:>11.1f}{stats['total_bytes']:>14,}"
+        )
+    return "\n".join(lines)
+
+
+class InMemoryMetricsSink(MetricsSink):
+    """Keep the most recent samples per stage in memory.
+
+    Args:
+        max_samples: Samples kept per stage; older samples are dropped
+    """
+
+    def __init__(self, max_samples: int = 10_000):
+        self._samples = defaultdict(lambda: deque(maxlen=max_samples))
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds, nbytes=0, **labels):
+        with self._lock:
+            self._samples[stage].append((seconds, nbytes))
+
+    def summary(self):
+        with self._lock:
+            samples = {stage: list(values) for stage, values in self._samples.items()}
+        return summarize_samples(samples)
+
+    def reset(self) -> None:
+        """Drop all recorded samples."""
+        with self._lock:
+            self._samples.clear()
+
+
+class JsonlMetricsSink(MetricsSink):
+    """Append each sample as a JSON line to a file.
+
+    Args:
+        path: File to append samples to
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds, nbytes=0, **labels):
+        line = json.dumps(
+            {"ts": time.time(), "stage": stage, "seconds": seconds, "bytes": nbytes, **labels},
+            separators=(",", ":"),
+        )
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def summary(self):
+        samples = defaultdict(list)
+        if not os.path.exists(self.path):
+            return {}  # nothing recorded yet
+        with self._lock, open(self.path, encoding="utf-8") as f:
+            for line in f:
+                sample = json.loads(line)
+                samples[sample["stage"]].append((sample["seconds"], sample["bytes"]))
+        return summarize_samples(samples)
+
+
+class PrometheusMetricsSink(InMemoryMetricsSink):
+    """In-memory samples exposed in the Prometheus text exposition format.
+
+    Args:
+        prefix: Metric name prefix
+        max_samples: Samples kept per stage for quantile estimates
+    """
+
+    def __init__(self, prefix: str = "research", max_samples: int = 10_000):
+        super().__init__(max_samples=max_samples)
+        self.prefix = prefix
+
+    def render(self) -> str:
+        """Render the current samples as Prometheus text."""
+        name = f"{self.prefix}_stage_seconds"
+        bytes_name = f"{self.prefix}_stage_bytes_total"
+        lines = [
+            f"# HELP {name} Duration of research pipeline stages.",
+            f"# TYPE {name} summary",
+        ]
+        summary = self.summary()
+        for stage, stats in summary.items():
+            lines.append(f'{name}{{stage="{stage}",quantile="0.5"}} {stats["p50"]}')
+            lines.append(f'{name}{{stage="{stage}",quantile="0.95"}} {stats["p95"]}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {stats["total_seconds"]}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {stats["count"]}')
+        lines.append(f"# HELP {bytes_name} Bytes handled by research pipeline stages.")
+        lines.append(f"# TYPE {bytes_name} counter")
+        for stage, stats in summary.items():
+            lines.append(f'{bytes_name}{{stage="{stage}"}} {stats["total_bytes"]}')
+        return "\n".join(lines) + "\n"
+
+
+_metrics_sink: MetricsSink = InMemoryMetricsSink()
+
+
+def set_metrics_sink(sink: MetricsSink) -> None:
+    """Send all subsequent stage timings to the given sink."""
+    global _metrics_sink
+    _metrics_sink = sink
+
+
+def get_metrics_sink() -> MetricsSink:
+    """Return the active metrics sink."""
+    return _metrics_sink
+
+
+@contextmanager
+def timed(stage: str, **labels):
+    """Time a block of code as one sample of a pipeline stage.
+
+    Yields a dict; set its ``bytes`` key inside the block to record a byte count.
+
+    Example:
+        with timed("url_fetch", backend="tavily") as sample:
+            response = client.get(url)
+            sample["bytes"] = len(response.content)
+    """
+    sample = {"bytes": 0}
+    start = time.perf_counter()
+    try:
+        yield sample
+    finally:
+        _metrics_sink.record(stage, time.perf_counter() - start, sample["bytes"], **labels)
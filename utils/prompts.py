@@ -137,6 +137,7 @@ You have access to two main tools:
 2. **think_tool**: For reflection and strategic planning during research
 
 **CRITICAL: Use think_tool after each search to reflect on results and plan next steps**
+**TIP: Pass several related queries as a list to a single tavily_search call - they run in parallel and count as one search**
 </Available Tools>
 
 <Instructions>
@@ -182,9 +183,10 @@ Your role is to coordinate research by delegating specific research tasks to sub
 </Task>
 
 <Available Tools>
-1. **task(description, subagent_type)**: Delegate research tasks to specialized sub-agents
+1. **task(description, subagent_type, files)**: Delegate research tasks to specialized sub-agents
    - description: Clear, specific research question or task
    - subagent_type: Type of agent to use (e.g., "research-agent")
+   - files (optional): Names of your files the sub-agent needs to read; other files are not shared
 2. **think_tool(reflection)**: Reflect on the results of each delegated task and plan next steps.
    - reflection: Your detailed reflection on the results of the task and next steps.
 
@@ -212,6 +214,7 @@ Your role is to coordinate research by delegating specific research tasks to sub
 
 **Important Reminders:**
 - Each **task** call creates a dedicated research agent with isolated context
-- Sub-agents can't see each other's work - provide complete standalone instructions
+- Sub-agents can't see each other's work or your files unless you pass them in `files` - provide complete standalone instructions
+- If parallel sub-agents write the same file, conflicts are listed in `file_conflicts.md` - review it and resolve any conflict markers
 - Use clear, specific language - avoid acronyms or abbreviations in task descriptions
 </Scaling Rules>"""
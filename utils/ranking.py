@@ -0,0 +1,82 @@
+"""Local relevance ranking for search results.
+
+This module scores search hits against the query with BM25 over titles and
+snippets, so that only the most relevant pages are fetched and summarized.
+"""
+
+import re
+
+import numpy as np
+
+# Standard BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def bm25_scores(
+    query: str, documents: list[str], k1: float = BM25_K1, b: float = BM25_B
+) -> np.ndarray:
+    """Score documents against a query with BM25.
+
+    Args:
+        query: Search query
+        documents: Texts to score
+        k1: Term frequency saturation parameter
+        b: Document length normalization parameter
+
+    Returns:
+        Array of scores, one per document
+    """
+    terms = sorted(set(tokenize(query)))
+    if not documents or not terms:
+        return np.zeros(len(documents))
+
+    term_index = {term: j for j, term in enumerate(terms)}
+    tf = np.zeros((len(documents), len(terms)))
+    lengths = np.zeros(len(documents))
+    for i, document in enumerate(documents):
+        tokens = tokenize(document)
+        lengths[i] = len(tokens)
+        for token in tokens:
+            j = term_index.get(token)
+            if j is not None:
+                tf[i, j] += 1
+
+    n_docs = len(documents)
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log((n_docs - df + 0.5) / (df + 0.5) + 1.0)
+    avg_length = lengths.mean() or 1.0
+    norm = k1 * (1.0 - b + b * lengths / avg_length)
+
+    return (idf * tf * (k1 + 1.0) / (tf + norm[:, None])).sum(axis=1)
+
+
+def rerank_results(query: str, results: dict, top_k: int) -> dict:
+    """Keep only the top-k search hits ranked by BM25 over title and snippet.
+
+    Args:
+        query: Search query the results were retrieved for
+        results: Tavily-style search results dictionary
+        top_k: Number of results to keep
+
+    Returns:
+        Copy of the results dictionary with the hits reordered and truncated
+    """
+    hits = results.get("results", [])
+    if len(hits) <= 1:
+        return results
+
+    documents = [f"{hit.get('title', '')} {hit.get('content', '')}" for hit in hits]
+    scores = bm25_scores(query, documents)
+
+    # Stable sort keeps the search engine's order for ties
+    order = np.argsort(-scores, kind="stable")[:top_k]
+
+    return {**results, "results": [hits[i] for i in order]}
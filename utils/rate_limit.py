@@ -0,0 +1,172 @@
+"""Rate limiting and retry helpers for search and page fetches.
+
+This module provides:
+- AdaptiveTokenBucket: a thread-safe token bucket whose rate backs off when the
+  remote side throttles and recovers gradually on success (AIMD)
+- get_rate_limiter: shared buckets keyed by search backend or host
+- Deadline: a wall-clock budget for one call, including its retries
+- retry_call: jittered exponential retry of transient failures
+"""
+
+import random
+import threading
+import time
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+# Default request rates (requests per second) for shared limiters
+SEARCH_REQUESTS_PER_SECOND = 5.0
+HOST_REQUESTS_PER_SECOND = 2.0
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a call cannot complete within its deadline."""
+
+
+class Deadline:
+    """Wall-clock budget for a call and all of its retries.
+
+    Args:
+        seconds: Budget in seconds, or None for no limit
+    """
+
+    def __init__(self, seconds: float | None):
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> float | None:
+        """Seconds left, or None if the deadline is unbounded."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+
+class AdaptiveTokenBucket:
+    """Thread-safe token bucket with additive-increase/multiplicative-decrease.
+
+    Args:
+        rate: Target tokens per second
+        capacity: Maximum burst size (default: one second's worth of tokens)
+        min_rate: Lowest rate the bucket backs off to
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None, min_rate: float = 0.1):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, deadline: Deadline | None = None) -> None:
+        """Take one token, waiting for it if necessary.
+
+        Raises:
+            DeadlineExceeded: If no token becomes available before the deadline
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) / self.rate
+
+            remaining = deadline.remaining() if deadline is not None else None
+            if remaining is not None and remaining < wait:
+                raise DeadlineExceeded("Rate limit wait exceeds the call deadline")
+            time.sleep(wait)
+
+    def throttled(self) -> None:
+        """Halve the rate after the remote side signalled overload."""
+        with self._lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def succeeded(self) -> None:
+        """Recover the rate gradually after a successful request."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill()
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+_limiters: dict[str, AdaptiveTokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(key: str, rate: float) -> AdaptiveTokenBucket:
+    """Return the shared limiter for a key, creating it with the given rate.
+
+    Args:
+        key: Limiter key, e.g. "search:tavily" or "host:example.com"
+        rate: Requests per second used when the limiter is first created
+    """
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = AdaptiveTokenBucket(rate)
+        return _limiters[key]
+
+
+def retry_call(
+    fn: Callable[[], T],
+    is_transient: Callable[[Exception], bool],
+    limiter: AdaptiveTokenBucket | None = None,
+    deadline: Deadline | None = None,
+    max_attempts: int = 4,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+) -> T:
+    """Call fn, retrying transient failures with jittered exponential backoff.
+
+    Each attempt first takes a token from the limiter. Transient failures slow
+    the limiter down; successes let it recover. Non-transient failures and the
+    last transient failure are re-raised.
+
+    Args:
+        fn: Zero-argument callable to run
+        is_transient: Returns True for exceptions worth retrying
+        limiter: Rate limiter to acquire from before each attempt
+        deadline: Budget for all attempts including backoff sleeps. fn should
+            bound its own request by ``deadline.remaining()``
+        max_attempts: Maximum number of attempts
+        base_delay: Backoff delay before the second attempt, in seconds
+        max_delay: Upper bound for a single backoff delay
+
+    Raises:
+        DeadlineExceeded: If the deadline runs out before a retry can start
+    """
+    for attempt in range(max_attempts):
+        if limiter is not None:
+            limiter.acquire(deadline)
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceeded("Call deadline exceeded before the request could start")
+        try:
+            result = fn()
+        except Exception as e:
+            if not is_transient(e) or attempt == max_attempts - 1:
+                raise
+            if limiter is not None:
+                limiter.throttled()
+
+            # Full jitter spreads out retries from parallel sub-agents
+            delay = random.uniform(0, min(max_delay, base_delay * 2**attempt))
+            remaining = deadline.remaining() if deadline is not None else None
+            if remaining is not None and remaining < delay:
+                raise DeadlineExceeded(f"Retry deadline exceeded: {e}") from e
+            time.sleep(delay)
+        else:
+            if limiter is not None:
+                limiter.succeeded()
+            return result
@@ -0,0 +1,78 @@
+"""Out-of-state storage for raw webpage content.
+
+Search result files keep only a reference to the raw page content, which is
+stored on disk by content hash. This keeps agent state (and every reducer call
+and checkpoint that copies it) small, while read_file can still materialize
+the full content when the agent reads past the summary section.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from functools import lru_cache
+
+# Directory holding raw content blobs, shared across processes and threads
+RAW_CONTENT_DIR = os.environ.get(
+    "RAW_CONTENT_DIR", os.path.join(tempfile.gettempdir(), "deep_agents_raw_content")
+)
+
+# Placeholder line written into virtual files in place of the raw content
+RAW_CONTENT_MARKER = "<!-- raw-content: {key} -->"
+
+_MARKER_RE = re.compile(r"<!-- raw-content: ([0-9a-f]{64}) -->")
+
+
+def _blob_path(key: str) -> str:
+    return os.path.join(RAW_CONTENT_DIR, f"{key}.md")
+
+
+def put_raw_content(content: str) -> str:
+    """Store raw content and return the marker that references it.
+
+    Args:
+        content: Raw page content
+
+    Returns:
+        Marker line to embed in the virtual file
+    """
+    key = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    path = _blob_path(key)
+
+    # Content addressed: identical pages are only written once
+    if not os.path.exists(path):
+        os.makedirs(RAW_CONTENT_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=RAW_CONTENT_DIR)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    return RAW_CONTENT_MARKER.format(key=key)
+
+
+@lru_cache(maxsize=32)
+def get_raw_content(key: str) -> str | None:
+    """Load raw content by key, or None if it is no longer available."""
+    try:
+        with open(_blob_path(key), encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def raw_content_line(content: str) -> int | None:
+    """Return the 0-based line index of the raw content marker, if any."""
+    match = _MARKER_RE.search(content)
+    if match is None:
+        return None
+    return content.count("\n", 0, match.start())
+
+
+def materialize_raw_content(content: str) -> str:
+    """Replace raw content markers with the stored content."""
+
+    def _load(match: re.Match) -> str:
+        raw = get_raw_content(match.group(1))
+        return raw if raw is not None else "Raw content is no longer available"
+
+    return _MARKER_RE.sub(_load, content)
@@ -0,0 +1,366 @@
+"""Record and replay of model, search and tool I/O.
+
+Scripts normally need the LM Studio server (and Tavily) to run, which makes
+them neither reproducible nor benchmarkable. A Cassette captures a run's I/O
+in a JSON file and serves it back deterministically:
+- CassetteChatModel: wraps a chat model; records requests and responses, or
+  replays them without the inner model
+- CassetteSearchBackend: wraps a search backend's search() and fetch()
+- CassetteToolRecorder: callback handler recording tool calls and results
+
+Requests are matched by a hash of their messages, tools and options. Prompts
+that embed values generated at run time (dates, random file ids) would never
+match exactly, so dates are masked before hashing and a request that still
+misses gets the next unplayed response recorded for the same route (system
+prompt, first user message and tools), in recorded order.
+
+Scripts opt in through the environment:
+- LLM_CASSETTE: cassette file path
+- LLM_CASSETTE_MODE: "record" or "replay" (default: replay if the file exists)
+- LLM_CASSETTE_LATENCY: seconds added to each replayed call, or "recorded" to
+  reproduce the recorded durations
+"""
+
+import asyncio
+import atexit
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from .search_backends import FetchError, SearchBackend, SearchError
+
+CASSETTE_VERSION = 1
+
+# Run-time values masked out of prompts before hashing
+VOLATILE_PATTERNS = [
+    re.compile(r"\b(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun) (?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) \d{1,2}, \d{4}\b"),
+    re.compile(r"\b\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?\b"),
+]
+
+# Call options that do not change the response
+_IGNORED_OPTIONS = {"ls_structured_output_format", "stream", "stream_usage", "tool_choice"}
+
+
+class CassetteMiss(KeyError):
+    """Raised in replay mode when no recorded response matches a request."""
+
+
+def _mask(text: str) -> str:
+    for pattern in VOLATILE_PATTERNS:
+        text = pattern.sub("<volatile>", text)
+    return text
+
+
+def _digest(obj) -> str:
+    payload = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=repr)
+    return hashlib.sha256(_mask(payload).encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """A JSON file of recorded interactions.
+
+    Args:
+        path: Cassette file
+        mode: "record" to capture a run, "replay" to serve it back
+        latency: Seconds added to each replayed call, or "recorded" to sleep for
+            the recorded duration; None replays instantly
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency: float | str | None = None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Cassette mode must be 'record' or 'replay', got {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.interactions: list[dict] = []
+        self._lock = threading.Lock()
+        self._served: set[int] = set()
+        self._by_key = defaultdict(deque)
+        self._by_route = defaultdict(deque)
+
+        if mode == "replay":
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version in {path}")
+            self.interactions = data["interactions"]
+            for index, interaction in enumerate(self.interactions):
+                kind = interaction["kind"]
+                self._by_key[(kind, interaction["key"])].append(index)
+                if interaction.get("route"):
+                    self._by_route[(kind, interaction["route"])].append(index)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    def record(self, kind: str, key: str, response, elapsed: float, route: str | None = None, **extra) -> None:
+        """Add one interaction (record mode)."""
+        with self._lock:
+            self.interactions.append({
+                "kind": kind,
+                "key": key,
+                "route": route,
+                "elapsed": round(elapsed, 4),
+                "response": response,
+                **extra,
+            })
+
+    def _next(self, queue: deque) -> int | None:
+        while queue:
+            index = queue.popleft()
+            if index not in self._served:
+                self._served.add(index)
+                return index
+        return None
+
+    def play(self, kind: str, key: str, route: str | None = None) -> dict:
+        """Return the recorded interaction for a request (replay mode).
+
+        Raises:
+            CassetteMiss: If neither the request nor its route has a response left
+        """
+        with self._lock:
+            index = self._next(self._by_key[(kind, key)])
+            if index is None and route is not None:
+                index = self._next(self._by_route[(kind, route)])
+        if index is None:
+            raise CassetteMiss(f"No recorded {kind} response for request {key[:12]} in {self.path}")
+        return self.interactions[index]
+
+    def delay(self, interaction: dict) -> float:
+        """Seconds to wait before serving a replayed interaction."""
+        if self.latency == "recorded":
+            return interaction["elapsed"]
+        return float(self.latency or 0.0)
+
+    def save(self) -> None:
+        """Write the recorded interactions to the cassette file."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {"version": CASSETTE_VERSION, "interactions": list(self.interactions)}
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+
+
+def _message_signature(message) -> list:
+    return [
+        message.type,
+        message.content,
+        [[tc["name"], tc["args"]] for tc in getattr(message, "tool_calls", None) or []],
+    ]
+
+
+def _tool_names(kwargs: dict) -> list[str]:
+    return sorted(
+        tool.get("function", {}).get("name", tool.get("name", "")) for tool in kwargs.get("tools") or []
+    )
+
+
+def _chat_keys(messages, stop, kwargs) -> tuple[str, str]:
+    """Return (request key, route key) for a chat request."""
+    tools = _tool_names(kwargs)
+    options = {k: v for k, v in kwargs.items() if k != "tools" and k not in _IGNORED_OPTIONS}
+    key = _digest({"messages": [_message_signature(m) for m in messages], "tools": tools, "stop": stop, "options": options})
+
+    system = next((m.content for m in messages if m.type == "system"), None)
+    first_user = next((m.content for m in messages if m.type == "human"), None)
+    route = _digest({"system": system, "user": first_user, "tools": tools})
+    return key, route
+
+
+class CassetteChatModel(BaseChatModel):
+    """Chat model that records an inner model's responses or replays them.
+
+    In replay mode the inner model is never called and may be None.
+    """
+
+    inner: BaseChatModel | None = None
+    cassette: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette"
+
+    def bind_tools(self, tools, **kwargs):
+        formatted = {"tools": [convert_to_openai_tool(t) for t in tools], **kwargs}
+        if self.cassette.recording:
+            # Send the inner model exactly the tool payload it would build itself
+            formatted = getattr(self.inner.bind_tools(tools, **kwargs), "kwargs", formatted)
+        return self.bind(**formatted)
+
+    def _record(self, key: str, route: str, result: ChatResult, elapsed: float) -> ChatResult:
+        self.cassette.record(
+            "chat", key, message_to_dict(result.generations[0].message), elapsed, route=route
+        )
+        return result
+
+    @staticmethod
+    def _result(interaction: dict) -> ChatResult:
+        message = messages_from_dict([interaction["response"]])[0]
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        key, route = _chat_keys(messages, stop, kwargs)
+        if self.cassette.recording:
+            start = time.perf_counter()
+            result = self.inner._generate(messages, stop=stop, **kwargs)
+            return self._record(key, route, result, time.perf_counter() - start)
+
+        interaction = self.cassette.play("chat", key, route)
+        time.sleep(self.cassette.delay(interaction))
+        return self._result(interaction)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        key, route = _chat_keys(messages, stop, kwargs)
+        if self.cassette.recording:
+            start = time.perf_counter()
+            result = await self.inner._agenerate(messages, stop=stop, **kwargs)
+            return self._record(key, route, result, time.perf_counter() - start)
+
+        interaction = self.cassette.play("chat", key, route)
+        await asyncio.sleep(self.cassette.delay(interaction))
+        return self._result(interaction)
+
+
+class CassetteSearchBackend(SearchBackend):
+    """Search backend that records an inner backend's searches and fetches or replays them."""
+
+    name = "cassette"
+
+    def __init__(self, inner: SearchBackend | None, cassette: Cassette):
+        self.inner = inner
+        self.cassette = cassette
+        if cassette.recording:
+            self.requests_per_second = inner.requests_per_second
+
+    def _call(self, kind: str, request: dict, fn):
+        key = _digest(request)
+        if self.cassette.recording:
+            start = time.perf_counter()
+            try:
+                response = fn()
+            except SearchError as e:
+                self.cassette.record(kind, key, None, time.perf_counter() - start, error={
+                    "type": type(e).__name__, "message": str(e), "transient": e.transient,
+                })
+                raise
+            self.cassette.record(kind, key, response, time.perf_counter() - start)
+            return response
+
+        interaction = self.cassette.play(kind, key)
+        time.sleep(self.cassette.delay(interaction))
+        if error := interaction.get("error"):
+            error_type = FetchError if error["type"] == "FetchError" else SearchError
+            raise error_type(error["message"], transient=error["transient"])
+        return interaction["response"]
+
+    def search(self, query, max_results=1, topic="general", include_raw_content=True, timeout=None):
+        request = {"query": query, "max_results": max_results, "topic": topic, "raw": include_raw_content}
+        return self._call(
+            "search", request,
+            lambda: self.inner.search(query, max_results, topic, include_raw_content, timeout=timeout),
+        )
+
+    def fetch(self, url, timeout=None):
+        return self._call("fetch", {"url": url}, lambda: self.inner.fetch(url, timeout=timeout))
+
+
+class CassetteToolRecorder(BaseCallbackHandler):
+    """Callback handler that records tool calls and results into a cassette.
+
+    Tool interactions are kept for inspection and comparison between runs;
+    tools themselves are replayed through the models and backends they call.
+    """
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+        self._started = {}
+
+    def on_tool_start(self, serialized, input_str, *, run_id, inputs=None, **kwargs):
+        self._started[run_id] = (serialized.get("name"), inputs or input_str, time.perf_counter())
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        if run_id not in self._started:
+            return
+        name, inputs, start = self._started.pop(run_id)
+        self.cassette.record(
+            "tool",
+            _digest({"name": name, "inputs": inputs}),
+            str(getattr(output, "content", output)),
+            time.perf_counter() - start,
+            name=name,
+            inputs=json.loads(json.dumps(inputs, default=repr)),
+        )
+
+
+_env_cassette: Cassette | None = None
+_env_cassette_lock = threading.Lock()
+
+
+def cassette_from_env() -> Cassette | None:
+    """Return the process-wide cassette configured by LLM_CASSETTE, if any.
+
+    In record mode the cassette is saved when the process exits.
+    """
+    global _env_cassette
+    path = os.environ.get("LLM_CASSETTE")
+    if not path:
+        return None
+    with _env_cassette_lock:
+        if _env_cassette is None:
+            mode = os.environ.get("LLM_CASSETTE_MODE") or ("replay" if os.path.exists(path) else "record")
+            latency = os.environ.get("LLM_CASSETTE_LATENCY")
+            if latency not in (None, "", "recorded"):
+                latency = float(latency)
+            _env_cassette = Cassette(path, mode=mode, latency=latency or None)
+            if _env_cassette.recording:
+                atexit.register(_env_cassette.save)
+    return _env_cassette
+
+
+def wrap_chat_model(model: BaseChatModel, cassette: Cassette | None = None) -> BaseChatModel:
+    """Wrap a chat model with the given (or environment) cassette; unchanged if none."""
+    cassette = cassette or cassette_from_env()
+    if cassette is None:
+        return model
+    return CassetteChatModel(inner=model, cassette=cassette)
+
+
+def install_research_cassette(cassette: Cassette | None = None) -> None:
+    """Route the research tools' summarization model and search backend through a cassette."""
+    from .research_tools import get_summarization_model, set_summarization_model
+    from .search_backends import get_search_backend, set_search_backend
+
+    cassette = cassette or cassette_from_env()
+    if cassette is None:
+        return
+    if cassette.recording:
+        set_summarization_model(CassetteChatModel(inner=get_summarization_model(), cassette=cassette))
+        set_search_backend(CassetteSearchBackend(get_search_backend(), cassette))
+    else:
+        set_summarization_model(CassetteChatModel(cassette=cassette))
+        set_search_backend(CassetteSearchBackend(None, cassette))
+
+
+def tool_callbacks(cassette: Cassette | None = None) -> list:
+    """Callbacks to pass in a run config so tool calls are recorded (record mode only)."""
+    cassette = cassette or cassette_from_env()
+    if cassette is None or not cassette.recording:
+        return []
+    return [CassetteToolRecorder(cassette)]
@@ -4,33 +4,76 @@ This module provides search and content processing utilities for the research ag
 including web search capabilities and content summarization tools.
 """
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import urlparse
 import uuid, base64
 
-import httpx
-from langchain_openai import ChatOpenAI
+from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import HumanMessage, ToolMessage
 from langchain_core.tools import InjectedToolArg, InjectedToolCallId, tool
 from langgraph.prebuilt import InjectedState
 from langgraph.types import Command
-from markdownify import markdownify
 from pydantic import BaseModel, Field
-from tavily import TavilyClient
 from typing_extensions import Annotated, Literal
 
+from .dedup import find_near_duplicate, simhash
+from .metrics import get_metrics_sink, timed
 from .prompts import SUMMARIZE_WEB_SEARCH
+from .ranking import rerank_results
+from .raw_store import put_raw_content
+from .rate_limit import (
+    HOST_REQUESTS_PER_SECOND,
+    Deadline,
+    DeadlineExceeded,
+    get_rate_limiter,
+    retry_call,
+)
+from .search_backends import SearchError, get_search_backend, get_tavily_client
 from .state import DeepAgentState
 
-llm_model = ChatOpenAI(
-    model="qwen/qwen3-4b-2507", 
-    base_url="http://127.0.0.1:1234/v1", 
-    temperature=0.0, 
-    api_key="11111111111111"
-)
+# Wall-clock budget (seconds) for one search or page fetch, including retries
+SEARCH_DEADLINE_SECONDS = 60.0
+FETCH_DEADLINE_SECONDS = 45.0
+
+# Summarization model, built on first use so importing this module stays cheap
+_summarization_model: BaseChatModel | None = None
+_summarization_model_lock = threading.Lock()
+
+
+def get_summarization_model() -> BaseChatModel:
+    """Return the shared summarization model, creating it on first use."""
+    global _summarization_model
+    if _summarization_model is None:
+        with _summarization_model_lock:
+            if _summarization_model is None:
+                from langchain_openai import ChatOpenAI
+
+                _summarization_model = ChatOpenAI(
+                    model="qwen/qwen3-4b-2507", 
+                    base_url="http://127.0.0.1:1234/v1", 
+                    temperature=0.0, 
+                    api_key="11111111111111"
+                )
+    return _summarization_model
+
+
+def set_summarization_model(model: BaseChatModel) -> None:
+    """Use the given chat model for webpage summarization."""
+    global _summarization_model
+    _summarization_model = model
+
+
+def __getattr__(name: str):
+    # Backwards compatible module attributes, resolved lazily
+    if name in ("llm_model", "summarization_model"):
+        return get_summarization_model()
+    if name == "tavily_client":
+        return get_tavily_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Summarization model 
-summarization_model = llm_model
-tavily_client = TavilyClient()
 
 class Summary(BaseModel):
     """Schema for webpage content summarization."""
@@ -47,7 +90,10 @@ def run_tavily_search(
     topic: Literal["general", "news", "finance"] = "general", 
     include_raw_content: bool = True, 
 ) -> dict:
-    """Perform search using Tavily API for a single query.
+    """Perform search using the active search backend for a single query.
+
+    The backend is Tavily by default; see utils.search_backends to search a
+    local document collection instead.
 
     Args:
         search_query: Search query to execute
@@ -57,16 +103,94 @@ def run_tavily_search(
 
     Returns:
         Search results dictionary
+
+    Raises:
+        SearchError: If the search still fails after retrying transient errors
+        DeadlineExceeded: If the search does not complete within its deadline
     """
-    result = tavily_client.search(
-        search_query,
-        max_results=max_results,
-        include_raw_content=include_raw_content,
-        topic=topic
-    )
+    backend = get_search_backend()
+    limiter = None
+    if backend.requests_per_second:
+        limiter = get_rate_limiter(f"search:{backend.name}", backend.requests_per_second)
+
+    deadline = Deadline(SEARCH_DEADLINE_SECONDS)
+    with timed("search_api", backend=backend.name) as sample:
+        # Each attempt may only use what is left of the deadline
+        result = retry_call(
+            lambda: backend.search(
+                search_query,
+                max_results=max_results,
+                topic=topic,
+                include_raw_content=include_raw_content,
+                timeout=deadline.remaining(),
+            ),
+            is_transient=_is_transient,
+            limiter=limiter,
+            deadline=deadline,
+        )
+        sample["bytes"] = sum(
+            len(r.get('content') or '') + len(r.get('raw_content') or '')
+            for r in result.get('results', [])
+        )
 
     return result
 
+def _is_transient(error: Exception) -> bool:
+    """Whether a search backend error is worth retrying."""
+    return isinstance(error, SearchError) and error.transient
+
+def run_tavily_searches(
+    search_queries: list[str],
+    max_results: int = 1,
+    top_k: int | None = None,
+    topic: Literal["general", "news", "finance"] = "general",
+    include_raw_content: bool = True,
+) -> dict:
+    """Run several searches concurrently and merge their results.
+
+    Each query's hits are ranked against that query and truncated to ``top_k``
+    before merging. Hits returned by more than one query are kept once, under
+    the first query that found them. A query that fails does not fail the
+    others; it is reported under ``failed_queries``.
+
+    Args:
+        search_queries: Search queries to execute
+        max_results: Maximum number of results per query
+        top_k: Number of top-ranked results to keep per query (default: all)
+        topic: Topic filter for search results
+        include_raw_content: Whether to include raw webpage content
+
+    Returns:
+        Merged search results dictionary; each hit records its ``query``
+    """
+    def _search(search_query: str) -> dict:
+        try:
+            results = run_tavily_search(
+                search_query,
+                max_results=max_results,
+                topic=topic,
+                include_raw_content=include_raw_content,
+            )
+        except (SearchError, DeadlineExceeded) as e:
+            return {'results': [], 'error': str(e)}
+        if top_k is not None:
+            results = rerank_results(search_query, results, top_k=top_k)
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(len(search_queries), 1)) as executor:
+        all_results = list(executor.map(_search, search_queries))
+
+    merged = {}
+    failed_queries = {}
+    for search_query, results in zip(search_queries, all_results):
+        if 'error' in results:
+            failed_queries[search_query] = results['error']
+        for result in results.get('results', []):
+            if result['url'] not in merged:
+                merged[result['url']] = {**result, 'query': search_query}
+
+    return {'results': list(merged.values()), 'failed_queries': failed_queries}
+
 def summarize_webpage_content(webpage_content: str) -> Summary:
     """Summarize webpage content using the configured summarization model.
 
@@ -78,15 +202,17 @@ def summarize_webpage_content(webpage_content: str) -> Summary:
     """
     try:
         # Set up structured output model for summarization
-        structured_model = summarization_model.with_structured_output(Summary)
+        structured_model = get_summarization_model().with_structured_output(Summary)
 
         # Generate summary
-        summary_and_filename = structured_model.invoke([
-            HumanMessage(content=SUMMARIZE_WEB_SEARCH.format(
-                webpage_content=webpage_content, 
-                date=get_today_str()
-            ))
-        ])
+        with timed("summarize") as sample:
+            sample["bytes"] = len(webpage_content)
+            summary_and_filename = structured_model.invoke([
+                HumanMessage(content=SUMMARIZE_WEB_SEARCH.format(
+                    webpage_content=webpage_content, 
+                    date=get_today_str()
+                ))
+            ])
 
         return summary_and_filename
 
@@ -98,104 +224,187 @@ def summarize_webpage_content(webpage_content: str) -> Summary:
         )
 
 
-def process_search_results(results: dict) -> list[dict]:
+def _fetch_search_result(result: dict) -> str | None:
+    """Fetch a search hit's page as markdown.
+
+    Fetches are rate limited per host and transient failures are retried with
+    backoff. If the page still cannot be fetched, the search API's own copy of
+    the page content is used instead.
+
+    Returns:
+        Page content, or None if no content is available for this hit
+    """
+    url = result['url']
+    backend = get_search_backend()
+    limiter = None
+    if urlparse(url).scheme in ("http", "https"):
+        limiter = get_rate_limiter(f"host:{urlparse(url).netloc}", HOST_REQUESTS_PER_SECOND)
+
+    deadline = Deadline(FETCH_DEADLINE_SECONDS)
+    try:
+        return retry_call(
+            lambda: backend.fetch(url, timeout=deadline.remaining()),
+            is_transient=_is_transient,
+            limiter=limiter,
+            deadline=deadline,
+        )
+    except (SearchError, DeadlineExceeded):
+        # Degrade to the search API's copy rather than storing an error stub
+        return result.get('raw_content') or None
+
+
+def process_search_results(
+    results: dict, fingerprints: dict[str, str] | None = None
+) -> list[dict]:
     """Process search results by summarizing content where available.
 
+    Pages are fetched and summarized concurrently. Hits whose content cannot be
+    fetched at all are marked ``unavailable`` and not stored. Pages that are near-duplicates
+    of a page already stored (per the fingerprint index) or of an earlier page in
+    the same batch are not summarized; their result points at the existing file
+    through ``duplicate_of`` instead.
+
     Args:
         results: Tavily search results dictionary
+        fingerprints: Index of known content fingerprints mapped to filenames
 
     Returns:
         List of processed results with summaries
     """
-    processed_results = []
-
-    # Create a client for HTTP requests with timeout
-    HTTPX_CLIENT = httpx.Client(timeout=30.0)  # Add 30 second timeout
-
-    for result in results.get('results', []):
-
-        # Get url 
-        url = result['url']
+    with timed("process_results") as sample:
+        processed_results = _process_search_results(results, fingerprints)
+        sample["bytes"] = sum(len(r.get('raw_content') or '') for r in processed_results)
+    return processed_results
 
-        # Read url with timeout and error handling
-        try:
-            response = HTTPX_CLIENT.get(url)
-
-            if response.status_code == 200:
-                # Convert HTML to markdown
-                raw_content = markdownify(response.text)
-                summary_obj = summarize_webpage_content(raw_content)
-            else:
-                # Use Tavily's generated summary
-                raw_content = result.get('raw_content', '')
-                summary_obj = Summary(
-                    filename="URL_error.md",
-                    summary=result.get('content', 'Error reading URL; try another search.')
-                )
-        except (httpx.TimeoutException, httpx.RequestError) as e:
-            # Handle timeout or connection errors gracefully
-            raw_content = result.get('raw_content', '')
-            summary_obj = Summary(
-                filename="connection_error.md",
-                summary=result.get('content', f'Could not fetch URL (timeout/connection error). Try another search.')
-            )
 
-        # uniquify file names
-        uid = base64.urlsafe_b64encode(uuid.uuid4().bytes).rstrip(b"=").decode("ascii")[:8]
-        name, ext = os.path.splitext(summary_obj.filename)
-        summary_obj.filename = f"{name}_{uid}{ext}"
+def _process_search_results(results: dict, fingerprints: dict[str, str] | None) -> list[dict]:
+    """Fetch, deduplicate and summarize search hits (see process_search_results)."""
+    hits = results.get('results', [])
+    if not hits:
+        return []
+
+    with ThreadPoolExecutor(max_workers=len(hits)) as executor:
+        fetched = list(executor.map(_fetch_search_result, hits))
+
+        # Skip summarization for mirrored or syndicated copies of known pages;
+        # this pass is sequential so that pages in one batch dedup each other
+        seen = dict(fingerprints or {})
+        reserved = {}
+        processed_results = []
+        to_summarize = []
+        for result, raw_content in zip(hits, fetched):
+            fingerprint = simhash(raw_content or '')
+            processed = {
+                'url': result['url'],
+                'title': result['title'],
+                'query': result.get('query'),
+                'fingerprint': fingerprint,
+            }
+            processed_results.append(processed)
+
+            if raw_content is None:
+                processed['unavailable'] = True
+                continue
+
+            duplicate_of = find_near_duplicate(fingerprint, seen)
+            if duplicate_of is not None:
+                processed['duplicate_of'] = duplicate_of
+                continue
+
+            # uniquify file names (reserved now so later pages can point here)
+            uid = base64.urlsafe_b64encode(uuid.uuid4().bytes).rstrip(b"=").decode("ascii")[:8]
+            processed['raw_content'] = raw_content
+            processed['uid'] = uid
+            if fingerprint is not None:
+                seen[fingerprint] = uid
+                reserved[uid] = processed
+            to_summarize.append(processed)
+
+        summaries = executor.map(
+            lambda processed: summarize_webpage_content(processed['raw_content']),
+            to_summarize,
+        )
+        for processed, summary_obj in zip(to_summarize, summaries):
+            name, ext = os.path.splitext(summary_obj.filename)
+            processed['filename'] = f"{name}_{processed.pop('uid')}{ext}"
+            processed['summary'] = summary_obj.summary
 
-        processed_results.append({
-            'url': result['url'],
-            'title': result['title'],
-            'summary': summary_obj.summary,
-            'filename': summary_obj.filename,
-            'raw_content': raw_content,
-        })
+    # Point in-batch duplicates at the final filename of the page they copy
+    for processed in processed_results:
+        original = reserved.get(processed.get('duplicate_of'))
+        if original is not None:
+            processed['duplicate_of'] = original['filename']
 
     return processed_results
 
 
 @tool(parse_docstring=True)
 def tavily_search(
-    query: str,
+    query: str | list[str],
     state: Annotated[DeepAgentState, InjectedState],
     tool_call_id: Annotated[str, InjectedToolCallId],
-    max_results: Annotated[int, InjectedToolArg] = 1,
+    max_results: Annotated[int, InjectedToolArg] = 5,
+    top_k: Annotated[int, InjectedToolArg] = 1,
     topic: Annotated[Literal["general", "news", "finance"], InjectedToolArg] = "general",
 ) -> Command:
     """Search web and save detailed results to files while returning minimal context.
 
     Performs web search and saves full content to files for context offloading.
+    Raw page content is stored outside agent state and loaded by read_file on demand.
+    Candidates are ranked locally against the query and only the top-k pages
+    are fetched and summarized. Several queries can be passed at once; they run
+    concurrently and their results are merged into a single response.
     Returns only essential information to help the agent decide on next steps.
 
     Args:
-        query: Search query to execute
+        query: Search query to execute, or a list of related queries to run together
         state: Injected agent state for file storage
         tool_call_id: Injected tool call identifier
-        max_results: Maximum number of results to return (default: 1)
+        max_results: Number of candidate results to request from the search API (default: 5)
+        top_k: Number of top-ranked results per query to fetch and summarize (default: 1)
         topic: Topic filter - 'general', 'news', or 'finance' (default: 'general')
 
     Returns:
         Command that saves full results to files and provides minimal summary
     """
-    # Execute search
-    search_results = run_tavily_search(
-        query,
+    start = time.perf_counter()
+    queries = [query] if isinstance(query, str) else list(query)
+
+    # Execute searches concurrently, ranking each query's candidates locally
+    # so only the most relevant pages are fetched
+    search_results = run_tavily_searches(
+        queries,
         max_results=max_results,
+        top_k=top_k,
         topic=topic,
         include_raw_content=True,
-    ) 
+    )
 
-    # Process and summarize results
-    processed_results = process_search_results(search_results)
+    # Process and summarize results, skipping pages already stored in this thread
+    processed_results = process_search_results(
+        search_results, fingerprints=state.get("fingerprints", {})
+    )
 
     # Save each result to a file and prepare summary
+    state_update_start = time.perf_counter()
     files = state.get("files", {})
+    fingerprints = {}
     saved_files = []
     summaries = []
+    stored_bytes = 0
 
     for i, result in enumerate(processed_results):
+        if result.get('unavailable'):
+            summaries.append(f"- {result['url']}: could not be fetched (skipped)")
+            continue
+
+        if 'duplicate_of' in result:
+            # Point at the existing file instead of storing another copy
+            summaries.append(
+                f"- {result['url']}: duplicate of {result['duplicate_of']} (not stored again)"
+            )
+            continue
+
         # Use the AI-generated filename from summarization
         filename = result['filename']
 
@@ -203,31 +412,39 @@ def tavily_search(
         file_content = f"""# Search Result: {result['title']}
 
 **URL:** {result['url']}
-**Query:** {query}
+**Query:** {result['query']}
 **Date:** {get_today_str()}
 
 ## Summary
 {result['summary']}
 
 ## Raw Content
-{result['raw_content'] if result['raw_content'] else 'No raw content available'}
+{put_raw_content(result['raw_content']) if result['raw_content'] else 'No raw content available'}
 """
 
         files[filename] = file_content
+        stored_bytes += len(file_content)
         saved_files.append(filename)
         summaries.append(f"- {filename}: {result['summary']}...")
+        if result['fingerprint'] is not None:
+            fingerprints[result['fingerprint']] = filename
 
     # Create minimal summary for tool message - focus on what was collected
-    summary_text = f"""🔍 Found {len(processed_results)} result(s) for '{query}':
+    summary_text = f"""🔍 Found {len(processed_results)} result(s) for {', '.join(repr(q) for q in queries)}:
 
 {chr(10).join(summaries)}
-
+{''.join(f"{chr(10)}⚠️ Search failed for '{q}': {error}" for q, error in search_results['failed_queries'].items())}
 Files: {', '.join(saved_files)}
 💡 Use read_file() to access full details when needed."""
 
+    metrics = get_metrics_sink()
+    metrics.record("state_update", time.perf_counter() - state_update_start, stored_bytes)
+    metrics.record("tavily_search", time.perf_counter() - start, len(summary_text))
+
     return Command(
         update={
             "files": files,
+            "fingerprints": fingerprints,
             "messages": [
                 ToolMessage(summary_text, tool_call_id=tool_call_id)
             ],
@@ -261,3 +478,25 @@ def think_tool(reflection: str) -> str:
         Confirmation that reflection was recorded for decision-making
     """
     return f"Reflection recorded: {reflection}"
+
+
+def research_subagent_factory() -> dict:
+    """Build the research sub-agent graph for ProcessPoolTaskExecutor workers.
+
+    Mirrors the research-agent used by the full deep-agents example:
+    RESEARCHER_INSTRUCTIONS with tavily_search and think_tool on the local model.
+
+    Returns:
+        Dict mapping the sub-agent name to its compiled graph
+    """
+    from .prompts import RESEARCHER_INSTRUCTIONS
+    from .task_tool import get_compiled_agent
+
+    return {
+        "research-agent": get_compiled_agent(
+            RESEARCHER_INSTRUCTIONS.format(date=get_today_str()),
+            [tavily_search, think_tool],
+            get_summarization_model(),
+            DeepAgentState,
+        )
+    }
@@ -0,0 +1,433 @@
+"""Pluggable search backends for the research tools.
+
+This module defines the interface tavily_search uses to find and fetch pages,
+with two implementations:
+- TavilySearchBackend: web search through the Tavily API (the default)
+- LocalSearchBackend: offline BM25 search over a directory of markdown/HTML
+  documents, backed by an on-disk inverted index
+
+Set LOCAL_SEARCH_DIR to use the local backend by default, or call
+set_search_backend() before running an agent.
+"""
+
+import functools
+import json
+import os
+import pathlib
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from urllib.parse import unquote, urlparse
+
+import httpx
+import numpy as np
+from markdownify import markdownify
+from typing_extensions import Literal
+
+from .metrics import timed
+from .ranking import BM25_B, BM25_K1, tokenize
+from .rate_limit import SEARCH_REQUESTS_PER_SECOND
+
+_HTML_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+
+class SearchError(Exception):
+    """Raised when a search backend request fails.
+
+    Attributes:
+        transient: Whether the failure is likely to go away on retry
+            (timeouts, connection errors, rate limiting, server errors)
+    """
+
+    def __init__(self, message: str, transient: bool = False):
+        super().__init__(message)
+        self.transient = transient
+
+
+class FetchError(SearchError):
+    """Raised when a search result's page cannot be fetched."""
+
+
+class SearchBackend(ABC):
+    """Interface for search providers used by the research tools."""
+
+    name: str = "search"
+
+    # Requests per second allowed against this backend; None disables limiting
+    requests_per_second: float | None = None
+
+    @abstractmethod
+    def search(
+        self,
+        query: str,
+        max_results: int = 1,
+        topic: Literal["general", "news", "finance"] = "general",
+        include_raw_content: bool = True,
+        timeout: float | None = None,
+    ) -> dict:
+        """Search for a query.
+
+        Args:
+            timeout: Seconds this request may take (None: the backend's default)
+
+        Returns:
+            Tavily-style results dictionary: ``{"query": ..., "results": [...]}``
+            where each result has ``url``, ``title``, ``content`` (snippet),
+            ``score`` and optionally ``raw_content``
+
+        Raises:
+            SearchError: If the search request fails
+        """
+
+    @abstractmethod
+    def fetch(self, url: str, timeout: float | None = None) -> str:
+        """Fetch a search result's page as markdown.
+
+        Args:
+            url: Page to fetch
+            timeout: Seconds this request may take (None: the backend's default)
+
+        Raises:
+            FetchError: If the page cannot be fetched
+        """
+
+
+class TavilySearchBackend(SearchBackend):
+    """Web search through the Tavily API, fetching pages over HTTP."""
+
+    name = "tavily"
+    requests_per_second = SEARCH_REQUESTS_PER_SECOND
+
+    # Tavily's own default for a search request
+    SEARCH_TIMEOUT = 60.0
+
+    def __init__(self, client=None, timeout: float = 30.0):
+        self.client = client if client is not None else get_tavily_client()
+        self.timeout = timeout
+        self.http_client = httpx.Client(timeout=timeout)
+
+    def search(self, query, max_results=1, topic="general", include_raw_content=True, timeout=None):
+        import requests
+        from tavily import errors
+
+        try:
+            return self.client.search(
+                query,
+                max_results=max_results,
+                include_raw_content=include_raw_content,
+                topic=topic,
+                timeout=min(self.SEARCH_TIMEOUT, timeout) if timeout is not None else self.SEARCH_TIMEOUT,
+            )
+        except (errors.UsageLimitExceededError, errors.TimeoutError, requests.ConnectionError) as e:
+            raise SearchError(f"Tavily search failed: {e}", transient=True) from e
+        except (
+            errors.BadRequestError,
+            errors.ForbiddenError,
+            errors.InvalidAPIKeyError,
+            errors.MissingAPIKeyError,
+            errors.KeylessUnsupportedEndpointError,
+        ) as e:
+            # Rejected query or credentials: retrying cannot help
+            raise SearchError(f"Tavily search failed: {e}", transient=False) from e
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else 0
+            raise SearchError(f"Tavily search failed: {e}", transient=status >= 500) from e
+        except requests.RequestException as e:
+            raise SearchError(f"Tavily search failed: {e}", transient=True) from e
+
+    def fetch(self, url, timeout=None):
+        try:
+            with timed("url_fetch", backend=self.name) as sample:
+                response = self.http_client.get(
+                    url, timeout=min(self.timeout, timeout) if timeout is not None else self.timeout
+                )
+                sample["bytes"] = len(response.content)
+        except (httpx.TimeoutException, httpx.RequestError) as e:
+            raise FetchError(f"Could not fetch {url}: {e}", transient=True) from e
+
+        if response.status_code != 200:
+            raise FetchError(
+                f"Fetching {url} returned HTTP {response.status_code}",
+                transient=response.status_code == 429 or response.status_code >= 500,
+            )
+
+        # Convert HTML to markdown
+        with timed("markdownify", backend=self.name) as sample:
+            markdown = markdownify(response.text)
+            sample["bytes"] = len(markdown)
+        return markdown
+
+
+class LocalSearchBackend(SearchBackend):
+    """Offline BM25 search over a directory of markdown/HTML documents.
+
+    The inverted index is stored as JSON next to the documents, together with
+    each document's leading paragraphs for snippets. The documents are checked
+    for changes (files added, removed or modified) when the index is first
+    loaded, on refresh(), and every refresh_interval seconds if one is set, so
+    a search does not rescan the corpus.
+
+    Args:
+        directory: Root directory of the documents to index
+        index_path: Where to store the index (default: <directory>/.search_index.json)
+        snippet_chars: Length of the snippet returned as each result's content
+        refresh_interval: Seconds after which a search re-checks the documents
+            (default: only on first load and refresh())
+    """
+
+    name = "local"
+
+    EXTENSIONS = (".md", ".markdown", ".txt", ".html", ".htm")
+    INDEX_VERSION = 2
+    # Leading paragraphs stored per document to pick snippets from
+    SNIPPET_PARAGRAPHS = 20
+
+    def __init__(
+        self,
+        directory: str,
+        index_path: str | None = None,
+        snippet_chars: int = 300,
+        refresh_interval: float | None = None,
+    ):
+        self.directory = pathlib.Path(directory).expanduser().resolve()
+        self.index_path = pathlib.Path(
+            index_path or self.directory / ".search_index.json"
+        )
+        self.snippet_chars = snippet_chars
+        self.refresh_interval = refresh_interval
+        self._index = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    # -- documents ---------------------------------------------------------
+
+    def _document_paths(self) -> list[pathlib.Path]:
+        return sorted(
+            p
+            for p in self.directory.rglob("*")
+            if p.is_file() and p.suffix.lower() in self.EXTENSIONS
+        )
+
+    @staticmethod
+    def _read_document(path: pathlib.Path) -> tuple[str, str]:
+        """Read a document as (title, markdown text)."""
+        text = path.read_text(encoding="utf-8", errors="replace")
+        title = path.stem
+        if path.suffix.lower() in (".html", ".htm"):
+            match = _HTML_TITLE_RE.search(text)
+            if match and match.group(1).strip():
+                return match.group(1).strip(), markdownify(text, heading_style="ATX")
+            text = markdownify(text, heading_style="ATX")
+
+        for line in text.splitlines():
+            if line.startswith("#"):
+                title = line.lstrip("#").strip() or title
+                break
+            if line.strip():
+                break
+        return title, text
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _read_cached(path: str, mtime_ns: int) -> tuple[str, str]:
+        """_read_document memoized per file version, for raw content of hits."""
+        return LocalSearchBackend._read_document(pathlib.Path(path))
+
+    def _signature(self, paths: list[pathlib.Path]) -> list[list]:
+        signature = []
+        for path in paths:
+            stat = path.stat()
+            signature.append([str(path.relative_to(self.directory)), stat.st_mtime_ns, stat.st_size])
+        return signature
+
+    # -- index -------------------------------------------------------------
+
+    def _build_index(self, paths: list[pathlib.Path], signature: list[list]) -> dict:
+        docs = []
+        postings: dict[str, list[list[int]]] = {}
+        for doc_id, path in enumerate(paths):
+            title, text = self._read_document(path)
+            tokens = tokenize(f"{title} {text}")
+            counts: dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for term, tf in counts.items():
+                ids_tfs = postings.setdefault(term, [[], []])
+                ids_tfs[0].append(doc_id)
+                ids_tfs[1].append(tf)
+            paragraphs = (p.strip() for p in text.split("\n\n") if p.strip())
+            docs.append({
+                "path": str(path.relative_to(self.directory)),
+                "title": title,
+                "length": len(tokens),
+                "paragraphs": [
+                    p[: self.snippet_chars]
+                    for _, p in zip(range(self.SNIPPET_PARAGRAPHS), paragraphs)
+                ],
+            })
+
+        index = {
+            "version": self.INDEX_VERSION,
+            "snippet_chars": self.snippet_chars,
+            "signature": signature,
+            "docs": docs,
+            "postings": postings,
+        }
+
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
+        return index
+
+    def _is_checked(self) -> bool:
+        if self._index is None or self._checked_at is None:
+            return False
+        return (
+            self.refresh_interval is None
+            or time.monotonic() - self._checked_at < self.refresh_interval
+        )
+
+    def _load_index(self) -> dict:
+        """Return the index, checking the documents for changes when due."""
+        # Lock-free fast path: concurrent searches share the loaded index
+        if self._is_checked():
+            return self._index
+        with self._lock:
+            if self._is_checked():
+                return self._index
+            paths = self._document_paths()
+            signature = self._signature(paths)
+            self._checked_at = time.monotonic()
+            if self._index is not None and self._index["signature"] == signature:
+                return self._index
+
+            index = None
+            if self.index_path.exists():
+                try:
+                    index = json.loads(self.index_path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    index = None
+            if (
+                index is None
+                or index.get("version") != self.INDEX_VERSION
+                or index.get("snippet_chars") != self.snippet_chars
+                or index.get("signature") != signature
+            ):
+                index = self._build_index(paths, signature)
+
+            lengths = np.array([doc["length"] for doc in index["docs"]], dtype=float)
+            index["norm"] = BM25_K1 * (
+                1.0 - BM25_B + BM25_B * lengths / ((lengths.mean() if len(lengths) else 0.0) or 1.0)
+            )
+            self._index = index
+            return index
+
+    def refresh(self) -> None:
+        """Re-check the documents now, rebuilding the index if they changed."""
+        with self._lock:
+            self._checked_at = None
+        self._load_index()
+
+    # -- search ------------------------------------------------------------
+
+    @staticmethod
+    def _snippet(paragraphs: list[str], terms: set[str]) -> str:
+        """Return the first paragraph mentioning a query term (or the first paragraph)."""
+        for paragraph in paragraphs:
+            if terms & set(tokenize(paragraph)):
+                return paragraph
+        return paragraphs[0] if paragraphs else ""
+
+    def search(self, query, max_results=1, topic="general", include_raw_content=True, timeout=None):
+        index = self._load_index()
+        docs = index["docs"]
+        terms = set(tokenize(query))
+        if not docs or not terms:
+            return {"query": query, "results": []}
+
+        norm = index["norm"]
+        scores = np.zeros(len(docs))
+        for term in terms:
+            if term not in index["postings"]:
+                continue
+            ids, tfs = index["postings"][term]
+            ids, tfs = np.asarray(ids), np.asarray(tfs, dtype=float)
+            idf = np.log((len(docs) - len(ids) + 0.5) / (len(ids) + 0.5) + 1.0)
+            scores[ids] += idf * tfs * (BM25_K1 + 1.0) / (tfs + norm[ids])
+
+        results = []
+        for doc_id in np.argsort(-scores, kind="stable")[:max_results]:
+            if scores[doc_id] <= 0:
+                break
+            doc = docs[doc_id]
+            path = self.directory / doc["path"]
+            result = {
+                "url": path.as_uri(),
+                "title": doc["title"],
+                "content": self._snippet(doc["paragraphs"], terms),
+                "score": float(scores[doc_id]),
+            }
+            if include_raw_content:
+                # signature entries are [path, mtime_ns, size], in doc order
+                mtime_ns = index["signature"][doc_id][1]
+                result["raw_content"] = self._read_cached(str(path), mtime_ns)[1]
+            results.append(result)
+
+        return {"query": query, "results": results}
+
+    def fetch(self, url, timeout=None):
+        path = pathlib.Path(unquote(urlparse(url).path))
+        try:
+            with timed("url_fetch", backend=self.name) as sample:
+                text = self._read_document(path)[1]
+                sample["bytes"] = len(text)
+            return text
+        except OSError as e:
+            raise FetchError(f"Could not read {path}: {e}") from e
+
+
+_tavily_client = None
+_tavily_client_lock = threading.Lock()
+_search_backend: SearchBackend | None = None
+_search_backend_lock = threading.Lock()
+
+
+def get_tavily_client():
+    """Return the shared Tavily client, creating it on first use.
+
+    Creating the client requires TAVILY_API_KEY, so it is deferred until a
+    search actually needs it.
+    """
+    global _tavily_client
+    if _tavily_client is None:
+        with _tavily_client_lock:
+            if _tavily_client is None:
+                from tavily import TavilyClient
+
+                _tavily_client = TavilyClient()
+    return _tavily_client
+
+
+def set_search_backend(backend: SearchBackend) -> None:
+    """Use the given backend for all subsequent searches."""
+    global _search_backend
+    _search_backend = backend
+
+
+def get_search_backend() -> SearchBackend:
+    """Return the active search backend, creating the default on first use.
+
+    The default is a LocalSearchBackend over LOCAL_SEARCH_DIR when that
+    environment variable is set, otherwise a TavilySearchBackend.
+    """
+    global _search_backend
+    if _search_backend is None:
+        with _search_backend_lock:
+            if _search_backend is None:
+                local_dir = os.environ.get("LOCAL_SEARCH_DIR")
+                _search_backend = (
+                    LocalSearchBackend(local_dir) if local_dir else TavilySearchBackend()
+                )
+    return _search_backend
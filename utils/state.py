@@ -12,6 +12,8 @@ from typing_extensions import TypedDict
 #from langgraph.prebuilt.chat_agent_executor import AgentState
 from langchain.agents import AgentState  # updated in 1.0
 
+from .file_merge import CONFLICTS_FILE, apply_file_update
+
 class Todo(TypedDict):
     """A structured task item for tracking progress through complex workflows.
 
@@ -28,7 +30,10 @@ def file_reducer(left, right):
     """Merge two file dictionaries, with right side taking precedence.
 
     Used as a reducer function for the files field in agent state,
-    allowing incremental updates to the virtual file system.
+    allowing incremental updates to the virtual file system. Right-side
+    values may also be versioned FileUpdate entries (see utils.file_merge);
+    these are checked against the current content and merged according to
+    their policy, with conflicts reported in CONFLICTS_FILE.
 
     Args:
         left: Left side dictionary (existing files)
@@ -37,12 +42,23 @@ def file_reducer(left, right):
     Returns:
         Merged dictionary with right values overriding left values
     """
-    if left is None:
-        return right
-    elif right is None:
+    if right is None:
         return left
-    else:
-        return {**left, **right}
+    elif left is None and all(isinstance(value, str) for value in right.values()):
+        return right
+
+    merged = dict(left or {})
+    conflicts = []
+    for name, value in right.items():
+        if isinstance(value, str):
+            merged[name] = value
+        elif (report := apply_file_update(merged, name, value)) is not None:
+            conflicts.append(report)
+
+    if conflicts:
+        existing = merged.get(CONFLICTS_FILE) or "# File conflicts\n"
+        merged[CONFLICTS_FILE] = existing.rstrip("\n") + "\n" + "\n".join(conflicts) + "\n"
+    return merged
 
 
 class DeepAgentState(AgentState):
@@ -51,7 +67,10 @@ class DeepAgentState(AgentState):
     Inherits from LangGraph's AgentState and adds:
     - todos: List of Todo items for task planning and progress tracking
     - files: Virtual file system stored as dict mapping filenames to content
+    - fingerprints: Content fingerprints of stored search results mapped to
+      filenames, used to skip near-duplicate pages across calls in a thread
     """
 
     todos: NotRequired[list[Todo]]
     files: Annotated[NotRequired[dict[str, str]], file_reducer]
+    fingerprints: Annotated[NotRequired[dict[str, str]], file_reducer]
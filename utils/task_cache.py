@@ -0,0 +1,116 @@
+"""Result cache for sub-agent delegations.
+
+Coordinators often re-delegate near-identical questions across turns or
+threads. TaskResultCache remembers the outcome of a delegation (final message,
+changed files and fingerprints) keyed by the sub-agent type, the normalized
+task description and the content of the files handed to the sub-agent, so a
+repeat can be answered without running the sub-agent again.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_description(description: str) -> str:
+    """Normalize a task description so trivially different phrasings match."""
+    text = _PUNCTUATION_RE.sub(" ", description.lower())
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+class TaskResultCache:
+    """Two-tier (in-process LRU + disk) cache of delegation outcomes with a TTL.
+
+    Args:
+        ttl_seconds: How long an entry stays valid
+        max_entries: Entries kept in the in-process LRU tier
+        disk_dir: Directory for the disk tier, or None to keep entries in memory only
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600.0,
+        max_entries: int = 128,
+        disk_dir: str | None = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(subagent_type: str, description: str, files: dict[str, str]) -> str:
+        """Build a cache key from the delegation inputs.
+
+        Args:
+            subagent_type: Name of the sub-agent delegated to
+            description: Task description given to the sub-agent
+            files: Files handed to the sub-agent, mapped to their content
+        """
+        file_hashes = sorted(
+            (name, hashlib.sha256(content.encode("utf-8")).hexdigest())
+            for name, content in files.items()
+        )
+        payload = json.dumps(
+            [subagent_type, normalize_description(description), file_hashes],
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _remember(self, key: str, created: float, value: dict) -> None:
+        self._entries[key] = (created, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> dict | None:
+        """Return the cached outcome for a key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            if key in self._entries:
+                created, value = self._entries[key]
+                if now - created <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+
+        if self.disk_dir is None:
+            return None
+        try:
+            with open(self._disk_path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if now - entry["created"] > self.ttl_seconds:
+            return None
+
+        # Promote disk hits into the in-process tier
+        with self._lock:
+            self._remember(key, entry["created"], entry["value"])
+        return entry["value"]
+
+    def put(self, key: str, value: dict) -> None:
+        """Store a delegation outcome (must be JSON serializable)."""
+        created = time.time()
+        with self._lock:
+            self._remember(key, created, value)
+
+        if self.disk_dir is None:
+            return
+        os.makedirs(self.disk_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"created": created, "value": value}, f, separators=(",", ":"))
+        os.replace(tmp_path, self._disk_path(key))
@@ -0,0 +1,136 @@
+"""Process-pool execution of sub-agent delegations.
+
+By default every sub-agent runs in the coordinator's process and shares its
+GIL with CPU-heavy steps such as markdownify, JSON parsing and tokenization.
+ProcessPoolTaskExecutor runs each delegation in a worker process instead:
+- Workers are started ahead of the first delegation and build the sub-agent
+  graphs once, through a factory given as a "module:function" import path
+- The isolated input state and the outcome (final message, changed files and
+  fingerprints, budget usage) cross the process boundary as zlib-compressed JSON
+
+Pass an executor to _create_task_tool(..., executor=...) to use it. Workers are
+spawned, so scripts that create one must keep their top-level code under an
+``if __name__ == "__main__":`` guard.
+"""
+
+import asyncio
+import importlib
+import json
+import multiprocessing
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from .metrics import timed
+
+# Sub-agent graphs built by the factory, keyed by sub-agent name (worker side)
+_worker_agents: dict | None = None
+
+
+def pack(obj) -> bytes:
+    """Serialize a JSON-compatible object compactly for the process boundary."""
+    return zlib.compress(json.dumps(obj, separators=(",", ":")).encode("utf-8"), 1)
+
+
+def unpack(data: bytes):
+    """Inverse of pack."""
+    return json.loads(zlib.decompress(data).decode("utf-8"))
+
+
+def load_factory(path: str):
+    """Import a "module:function" factory path."""
+    module_name, _, attribute = path.partition(":")
+    if not attribute:
+        raise ValueError(f"Factory must be given as 'module:function', got {path!r}")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _init_worker(factory: str) -> None:
+    # Build (and compile) every sub-agent graph once per worker process
+    global _worker_agents
+    _worker_agents = load_factory(factory)()
+
+
+def _ping() -> int:
+    return len(_worker_agents)
+
+
+def _run_in_worker(subagent_type: str, payload: bytes) -> bytes:
+    from .task_tool import run_delegation
+
+    request = unpack(payload)
+    if subagent_type not in _worker_agents:
+        raise KeyError(
+            f"Sub-agent {subagent_type!r} is not built by the worker factory "
+            f"(available: {sorted(_worker_agents)})"
+        )
+    outcome = run_delegation(
+        _worker_agents[subagent_type],
+        request["state"],
+        request["budget"],
+        {"run_name": f"task:{subagent_type}", "metadata": {"subagent_type": subagent_type}},
+    )
+    return pack(outcome)
+
+
+class ProcessPoolTaskExecutor:
+    """Run delegations in a warm pool of worker processes.
+
+    Args:
+        factory: Import path ("module:function") of a zero-argument callable that
+            returns a dict mapping sub-agent names to compiled graphs, e.g.
+            "utils.research_tools:research_subagent_factory"
+        max_workers: Number of worker processes (default: number of CPUs)
+        warm: Start all workers and build their graphs immediately instead of
+            on the first delegations
+    """
+
+    def __init__(self, factory: str, max_workers: int | None = None, warm: bool = True):
+        self.factory = factory
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        # Spawned workers do not inherit the coordinator's threads and locks
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(factory,),
+        )
+        if warm:
+            self.warm()
+
+    def warm(self) -> None:
+        """Start every worker and wait until its sub-agent graphs are built."""
+        futures = [self._pool.submit(_ping) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def _payload(self, sub_state: dict, budget: dict | None) -> bytes:
+        with timed("task_payload") as sample:
+            payload = pack({"state": sub_state, "budget": budget})
+            sample["bytes"] = len(payload)
+        return payload
+
+    def run(self, subagent_type: str, sub_state: dict, budget: dict | None = None) -> dict:
+        """Run one delegation in a worker and return its outcome.
+
+        Args:
+            subagent_type: Name of the sub-agent, as built by the factory
+            sub_state: Isolated input state (JSON-compatible)
+            budget: Limits for the run; deadlines are checked between steps
+        """
+        future = self._pool.submit(_run_in_worker, subagent_type, self._payload(sub_state, budget))
+        return unpack(future.result())
+
+    async def arun(self, subagent_type: str, sub_state: dict, budget: dict | None = None) -> dict:
+        """Async version of run; the event loop stays free while the worker runs."""
+        future = self._pool.submit(_run_in_worker, subagent_type, self._payload(sub_state, budget))
+        return unpack(await asyncio.wrap_future(future))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes."""
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
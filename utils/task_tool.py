@@ -5,18 +5,83 @@ with isolated contexts. Sub-agents prevent context clash by operating with clean
 context windows containing only their specific task description.
 """
 
-from typing import Annotated, NotRequired
+import asyncio
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Annotated, NotRequired
 from typing_extensions import TypedDict
 
-from langchain_core.messages import ToolMessage
-from langchain_core.tools import BaseTool, InjectedToolCallId, tool
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import (
+    BaseTool,
+    InjectedToolArg,
+    InjectedToolCallId,
+    StructuredTool,
+    tool,
+)
 from langgraph.prebuilt import InjectedState  # updated 1.0
 from langchain.agents import create_agent  # updated 1.0
 
+from langgraph.config import get_config, get_stream_writer
 from langgraph.types import Command
 
+from .delegation import DelegationScheduler
+from .file_merge import MergePolicy
 from .prompts import TASK_DESCRIPTION_PREFIX
 from .state import DeepAgentState
+from .task_cache import TaskResultCache
+
+if TYPE_CHECKING:
+    from .task_executor import ProcessPoolTaskExecutor
+
+
+class TaskBudget(TypedDict, total=False):
+    """Limits for a single delegation; omitted limits are unbounded.
+
+    Attributes:
+        max_steps: Maximum number of model calls the sub-agent may make
+        max_tokens: Maximum total LLM tokens (as reported in usage metadata)
+        timeout_seconds: Wall-clock deadline for the whole delegation
+    """
+
+    max_steps: int
+    max_tokens: int
+    timeout_seconds: float
+
+
+class ResultPolicy(TypedDict, total=False):
+    """How sub-agent results enter the coordinator's context.
+
+    Attributes:
+        max_tokens: Results estimated above this many tokens are written to a
+            virtual file instead of being returned verbatim
+        summary_tokens: Size of the summary returned in place of an offloaded result
+    """
+
+    max_tokens: int
+    summary_tokens: int
+
+
+DEFAULT_RESULT_MAX_TOKENS = 1000
+DEFAULT_RESULT_SUMMARY_TOKENS = 150
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English text (about 4 characters per token)."""
+    return len(text) // 4
+
+
+def _head_summary(text: str, max_chars: int) -> str:
+    """Return the start of text, cut at a paragraph or sentence boundary if possible."""
+    if len(text) <= max_chars:
+        return text
+    head = text[:max_chars]
+    for separator in ("\n\n", "\n", ". "):
+        cut = head.rfind(separator)
+        if cut > max_chars // 2:
+            return head[: cut + 1].rstrip()
+    return head.rstrip() + "…"
 
 
 class SubAgent(TypedDict):
@@ -26,26 +91,303 @@ class SubAgent(TypedDict):
     description: str
     prompt: str
     tools: NotRequired[list[str]]
+    budget: NotRequired[TaskBudget]
+    can_delegate: NotRequired[bool]
+
+
+class _BudgetTracker:
+    """Track a delegation's usage against its budget from state snapshots."""
+
+    def __init__(self, budget: TaskBudget | None):
+        self.budget = budget or {}
+        self.started = time.monotonic()
+        self.steps = 0
+        self.tokens = 0
+        self.exhausted = None
+
+    def remaining_seconds(self) -> float | None:
+        if "timeout_seconds" not in self.budget:
+            return None
+        return max(0.0, self.budget["timeout_seconds"] - (time.monotonic() - self.started))
+
+    def update(self, state: dict) -> bool:
+        """Record a state snapshot; return True if the sub-agent must stop."""
+        ai_messages = [m for m in state.get("messages", []) if isinstance(m, AIMessage)]
+        self.steps = len(ai_messages)
+        self.tokens = sum((m.usage_metadata or {}).get("total_tokens", 0) for m in ai_messages)
+
+        # A final answer is never cut off, even if it used up the budget
+        if ai_messages and not ai_messages[-1].tool_calls and state["messages"][-1] is ai_messages[-1]:
+            return False
+
+        if self.steps >= self.budget.get("max_steps", float("inf")):
+            self.exhausted = "max_steps"
+        elif self.tokens >= self.budget.get("max_tokens", float("inf")):
+            self.exhausted = "max_tokens"
+        elif self.remaining_seconds() == 0:
+            self.exhausted = "timeout_seconds"
+        return self.exhausted is not None
+
+    def usage(self) -> dict:
+        return {
+            "steps": self.steps,
+            "tokens": self.tokens,
+            "seconds": round(time.monotonic() - self.started, 3),
+            "limits": dict(self.budget),
+            "exhausted": self.exhausted,
+        }
+
+
+def _partial_findings(state: dict, reason: str) -> str:
+    """Summarize what a sub-agent produced before its budget ran out."""
+    findings = [
+        str(m.text) for m in state.get("messages", [])
+        if isinstance(m, AIMessage) and m.text.strip()
+    ]
+    latest = findings[-1] if findings else "No findings were produced before the budget ran out."
+    return f"[Delegation stopped early: {reason} budget exhausted. Partial findings below.]\n\n{latest}"
+
+
+def _configured_budget() -> TaskBudget | None:
+    """Per-run budget override from ``config["configurable"]["task_budget"]``.
+
+    ToolNode does not fill plain InjectedToolArg parameters, so during an agent
+    run the task tool's ``budget`` argument is always None; the run config is
+    how a caller sets a budget for the delegations of one invocation.
+    """
+    try:
+        return get_config().get("configurable", {}).get("task_budget")
+    except RuntimeError:
+        return None  # Called outside of a runnable context
+
+
+def _announce_delegation(subagent_type: str, description: str, tool_call_id: str) -> None:
+    """Emit a custom stream event naming the delegation that is about to run.
+
+    Sub-agents run inside the task tool's runnable context, so their node updates
+    and tokens reach the parent's ``stream(..., subgraphs=True)`` under the tool
+    call's namespace (``("tools:<task id>",)``). This event maps that namespace to
+    the sub-agent type and description so stream consumers can label it.
+    """
+    try:
+        checkpoint_ns = get_config().get("configurable", {}).get("checkpoint_ns")
+    except RuntimeError:
+        checkpoint_ns = None
+    if not checkpoint_ns:
+        return  # Called outside of a graph run, nobody is streaming
+    get_stream_writer()({
+        "delegation": {
+            "namespace": checkpoint_ns.split("|"),
+            "subagent_type": subagent_type,
+            "description": description,
+            "tool_call_id": tool_call_id,
+        }
+    })
+
+
+def _delegation_config(subagent_type: str, tool_call_id: str) -> dict:
+    """Run config for a sub-agent; the parent's callbacks and stream are inherited."""
+    return {
+        "run_name": f"task:{subagent_type}",
+        "metadata": {"subagent_type": subagent_type, "delegation_id": tool_call_id},
+    }
+
+
+def _stream_with_budget(sub_agent, sub_state: dict, tracker: _BudgetTracker, config: dict | None) -> dict:
+    # Stream state snapshots so the run can be stopped between steps;
+    # the deadline is only checked between steps in sync mode
+    result = sub_state
+    for snapshot in sub_agent.stream(sub_state, config, stream_mode="values"):
+        result = snapshot
+        if tracker.update(snapshot):
+            break
+    return result
+
+
+async def _astream_with_budget(
+    sub_agent, sub_state: dict, tracker: _BudgetTracker, config: dict | None
+) -> dict:
+    # In async mode the deadline also cancels an in-flight model or tool call
+    result = sub_state
+    try:
+        async with asyncio.timeout(tracker.remaining_seconds()):
+            async for snapshot in sub_agent.astream(sub_state, config, stream_mode="values"):
+                result = snapshot
+                if tracker.update(snapshot):
+                    break
+    except TimeoutError:
+        tracker.exhausted = "timeout_seconds"
+    return result
+
+
+def _snapshot(sub_state: dict) -> dict:
+    return {
+        "files": dict(sub_state.get("files", {})),
+        "fingerprints": dict(sub_state.get("fingerprints", {})),
+    }
+
+
+def _delegation_outcome(result: dict, shared: dict, tracker: _BudgetTracker) -> dict:
+    # Keep only what the sub-agent created or changed. Content is flattened to
+    # text (models such as Anthropic's return a list of blocks) so it can be
+    # measured, offloaded and serialized like any other result
+    return {
+        "content": (
+            _partial_findings(result, tracker.exhausted)
+            if tracker.exhausted
+            else str(result["messages"][-1].text)
+        ),
+        "usage": tracker.usage(),
+        "files": {
+            name: content
+            for name, content in result.get("files", {}).items()
+            if shared["files"].get(name) != content
+        },
+        "fingerprints": {
+            fingerprint: name
+            for fingerprint, name in result.get("fingerprints", {}).items()
+            if fingerprint not in shared["fingerprints"]
+        },
+    }
+
+
+def run_delegation(
+    sub_agent, sub_state: dict, budget: TaskBudget | None = None, config: dict | None = None
+) -> dict:
+    """Run a sub-agent on an isolated state within a budget.
+
+    Args:
+        sub_agent: Compiled sub-agent graph
+        sub_state: Isolated input state (task message, shared files, fingerprints)
+        budget: Limits for the run
+        config: Run config for the sub-agent graph
+
+    Returns:
+        Outcome dict with the final ``content``, budget ``usage`` and only the
+        ``files`` and ``fingerprints`` the sub-agent created or changed
+    """
+    shared = _snapshot(sub_state)
+    tracker = _BudgetTracker(budget)
+    result = _stream_with_budget(sub_agent, sub_state, tracker, config)
+    return _delegation_outcome(result, shared, tracker)
+
+
+async def arun_delegation(
+    sub_agent, sub_state: dict, budget: TaskBudget | None = None, config: dict | None = None
+) -> dict:
+    """Async version of run_delegation; the deadline also cancels in-flight calls."""
+    shared = _snapshot(sub_state)
+    tracker = _BudgetTracker(budget)
+    result = await _astream_with_budget(sub_agent, sub_state, tracker, config)
+    return _delegation_outcome(result, shared, tracker)
+
+
+# Compiled sub-agent graphs shared by every task tool in this process
+_compiled_agents = {}
+_compiled_agents_lock = threading.Lock()
+
+
+def _model_id(model) -> tuple:
+    """Identify a chat model by its class and main configuration.
+
+    Models without a model name (wrappers, fakes) are identified by instance.
+    """
+    name = getattr(model, "model_name", None) or getattr(model, "model", None)
+    if not isinstance(name, str):
+        return (type(model).__name__, id(model))
+    return (
+        type(model).__name__,
+        name,
+        getattr(model, "openai_api_base", None),
+        getattr(model, "temperature", None),
+    )
 
 
-def _create_task_tool(tools, subagents: list[SubAgent], model, state_schema):
+def get_compiled_agent(prompt: str, tools: list[BaseTool], model, state_schema):
+    """Return the compiled agent graph for a sub-agent configuration.
+
+    Graphs are compiled on first request and memoized by
+    (prompt, tool names, model id, state schema), so task tools that configure
+    the same sub-agent share one compiled graph.
+
+    Args:
+        prompt: System prompt of the sub-agent
+        tools: Tools available to the sub-agent
+        model: The language model to use
+        state_schema: The state schema (typically DeepAgentState)
+
+    Returns:
+        Compiled agent graph
+    """
+    key = (
+        prompt,
+        tuple(t.name for t in tools),
+        _model_id(model),
+        f"{state_schema.__module__}.{state_schema.__qualname__}",
+    )
+    if key not in _compiled_agents:
+        with _compiled_agents_lock:
+            if key not in _compiled_agents:
+                _compiled_agents[key] = create_agent(   # updated 1.0
+                    model, system_prompt=prompt, tools=tools, state_schema=state_schema
+                )
+    return _compiled_agents[key]
+
+
+def _create_task_tool(
+    tools,
+    subagents: list[SubAgent],
+    model,
+    state_schema,
+    max_concurrent: int | None = None,
+    result_cache: TaskResultCache | None = None,
+    default_budget: TaskBudget | None = None,
+    merge_policy: MergePolicy = "merge",
+    result_policy: ResultPolicy | None = None,
+    executor: "ProcessPoolTaskExecutor | None" = None,
+    scheduler: DelegationScheduler | None = None,
+):
     """Create a task delegation tool that enables context isolation through sub-agents.
 
     This function implements the core pattern for spawning specialized sub-agents with
     isolated contexts, preventing context clash and confusion in complex multi-step tasks.
+    Sub-agent graphs are compiled the first time they are delegated to and shared
+    through get_compiled_agent.
 
     Args:
         tools: List of available tools that can be assigned to sub-agents
         subagents: List of specialized sub-agent configurations
         model: The language model to use for all agents
         state_schema: The state schema (typically DeepAgentState)
+        max_concurrent: Maximum number of sub-agents running at once (default: no limit)
+        result_cache: Optional cache; repeated delegations with the same sub-agent type,
+            normalized description and shared files return the cached result
+        default_budget: Budget applied to delegations whose sub-agent configuration
+            and call do not specify one. A call's budget comes from the tool's
+            ``budget`` argument when invoked directly, or from
+            ``config["configurable"]["task_budget"]`` during an agent run. When a budget runs out the sub-agent is
+            stopped and its partial findings and files are returned; usage is
+            reported in the ToolMessage's response_metadata["budget"]
+        merge_policy: What happens when a sub-agent writes a file that changed since it
+            was handed over, e.g. by a concurrent sibling: "reject", "rename" or "merge"
+            (three-way merge). Conflicts are reported in the file_conflicts.md virtual file
+        result_policy: If given, results estimated above ``max_tokens`` are written to a
+            ``task_result_<subagent>_<id>.md`` virtual file and the ToolMessage carries only
+            the head of the result and the file path, keeping the coordinator's prompt small.
+            By default results are returned verbatim
+        executor: Optional ProcessPoolTaskExecutor that runs each delegation in a warm
+            worker process instead of in this process. Its factory must build the same
+            sub-agents; sub-agent progress is then not streamed to the parent
+        scheduler: Shared limits on delegation depth and on sub-agents running at once
+            across all levels; overrides max_concurrent. Sub-agents configured with
+            ``can_delegate`` receive this task tool themselves. By default a scheduler
+            is created with max_concurrent and a depth of 2 if any sub-agent can
+            delegate, otherwise 1
 
     Returns:
-        A 'task' tool that can delegate work to specialized sub-agents
+        A 'task' tool that can delegate work to specialized sub-agents. It supports
+        both invoke and ainvoke; under ainvoke, parallel task calls run concurrently.
     """
-    # Create agent registry
-    agents = {}
-
     # Build tool name mapping for selective tool assignment
     tools_by_name = {}
     for tool_ in tools:
@@ -53,60 +395,234 @@ def _create_task_tool(tools, subagents: list[SubAgent], model, state_schema):
             tool_ = tool(tool_)
         tools_by_name[tool_.name] = tool_
 
-    # Create specialized sub-agents based on configurations
+    # Resolve each sub-agent's tools now; graphs are compiled on first use
+    agent_tools = {}
     for _agent in subagents:
         if "tools" in _agent:
             # Use specific tools if specified
-            _tools = [tools_by_name[t] for t in _agent["tools"]]
+            agent_tools[_agent["name"]] = [tools_by_name[t] for t in _agent["tools"]]
         else:
             # Default to all tools
-            _tools = tools
-        agents[_agent["name"]] = create_agent(   # updated 1.0
-            model, system_prompt=_agent["prompt"], tools=_tools, state_schema=state_schema
-        )
+            agent_tools[_agent["name"]] = list(tools_by_name.values())
+    prompts = {_agent["name"]: _agent["prompt"] for _agent in subagents}
+    budgets = {_agent["name"]: _agent.get("budget", default_budget) for _agent in subagents}
+    delegating = {_agent["name"] for _agent in subagents if _agent.get("can_delegate")}
+    agents = {}
+
+    def _get_agent(name: str):
+        if name not in agents:
+            if name in delegating:
+                # Delegating sub-agents embed this task tool, so their graphs
+                # belong to it rather than to the shared compiled-graph cache
+                agents[name] = create_agent(
+                    model,
+                    system_prompt=prompts[name],
+                    tools=agent_tools[name] + [task_tool],
+                    state_schema=state_schema,
+                )
+            else:
+                agents[name] = get_compiled_agent(
+                    prompts[name], agent_tools[name], model, state_schema
+                )
+        return agents[name]
 
     # Generate description of available sub-agents for the tool description
     other_agents_string = [
         f"- {_agent['name']}: {_agent['description']}" for _agent in subagents
     ]
 
-    @tool(description=TASK_DESCRIPTION_PREFIX.format(other_agents=other_agents_string))
+    # Limit delegation depth and how many sub-agents run at once, across all levels
+    if scheduler is None:
+        scheduler = DelegationScheduler(
+            max_depth=2 if delegating else 1, max_concurrent_agents=max_concurrent
+        )
+
+    def _isolated_state(
+        state: DeepAgentState, description: str, files: list[str] | None
+    ) -> tuple[dict, dict]:
+        # Create isolated context with only the task description
+        # This is the key to context isolation - no parent history, no todos,
+        # and only the files the parent chose to share
+        parent_files = state.get("files", {})
+        shared_files = {name: parent_files[name] for name in files or [] if name in parent_files}
+        shared = {
+            "files": shared_files,
+            # Only fingerprints of shared files: a duplicate reported against a
+            # file the sub-agent cannot read would lose that content for it
+            "fingerprints": {
+                fingerprint: name
+                for fingerprint, name in state.get("fingerprints", {}).items()
+                if name in shared_files
+            },
+        }
+        sub_state = {
+            "messages": [{"role": "user", "content": description}],
+            "files": dict(shared["files"]),
+            "fingerprints": dict(shared["fingerprints"]),
+        }
+        return sub_state, shared
+
+    def _compress(outcome: dict, subagent_type: str, tool_call_id: str) -> tuple[str, dict]:
+        # Offload long results to a virtual file the coordinator can read on demand
+        content = outcome["content"]
+        files = dict(outcome["files"])
+        tokens = estimate_tokens(content)
+        if result_policy is None or tokens <= result_policy.get("max_tokens", DEFAULT_RESULT_MAX_TOKENS):
+            return content, files
+
+        call_suffix = re.sub(r"\W", "", tool_call_id)[-12:]
+        file_path = f"task_result_{subagent_type}_{call_suffix}.md"
+        files[file_path] = content
+        summary_tokens = result_policy.get("summary_tokens", DEFAULT_RESULT_SUMMARY_TOKENS)
+        summary = _head_summary(content, summary_tokens * 4)
+        return (
+            f"{summary}\n\n[Full result (~{tokens} tokens) saved to `{file_path}`. "
+            "Use read_file to see the rest.]"
+        ), files
+
+    def _to_command(
+        outcome: dict, shared: dict, subagent_type: str, tool_call_id: str
+    ) -> Command:
+        message, changed_files = _compress(outcome, subagent_type, tool_call_id)
+        # Send files as versioned updates so file_reducer can detect writes that
+        # raced with a sibling delegation instead of silently keeping the last one
+        files = {
+            name: {
+                "content": content,
+                "base": shared["files"].get(name),
+                "policy": merge_policy,
+                "source": f"{subagent_type} ({tool_call_id})",
+            }
+            for name, content in changed_files.items()
+        }
+        # Return results to parent agent via Command state update
+        return Command(
+            update={
+                "files": files,
+                "fingerprints": outcome["fingerprints"],  # Keep dedup index in sync
+                "messages": [
+                    # Sub-agent result becomes a ToolMessage in parent context
+                    ToolMessage(
+                        message,
+                        tool_call_id=tool_call_id,
+                        response_metadata={"budget": outcome["usage"]},
+                    )
+                ],
+            }
+        )
+
+    def _cache_key(subagent_type: str, description: str, shared: dict) -> str | None:
+        if result_cache is None:
+            return None
+        return result_cache.make_key(subagent_type, description, shared["files"])
+
+    def _store(cache_key: str | None, outcome: dict) -> None:
+        # Partial results of cut-off runs are not worth replaying
+        if cache_key is not None and not outcome["usage"]["exhausted"]:
+            result_cache.put(cache_key, outcome)
+
+    def _cached(cache_key: str | None) -> dict | None:
+        if cache_key is None or (cached := result_cache.get(cache_key)) is None:
+            return None
+        return {**cached, "usage": {**cached["usage"], "cached": True}}
+
+    def _unknown_agent(subagent_type: str) -> str:
+        return f"Error: invoked agent of type {subagent_type}, the only allowed types are {[f'`{k}`' for k in prompts]}"
+
+    def _too_deep() -> str:
+        return f"Error: delegation depth limit of {scheduler.max_depth} reached, complete this task yourself"
+
     def task(
         description: str,
         subagent_type: str,
         state: Annotated[DeepAgentState, InjectedState],
         tool_call_id: Annotated[str, InjectedToolCallId],
+        files: list[str] | None = None,
+        budget: Annotated[TaskBudget | None, InjectedToolArg] = None,
     ):
         """Delegate a task to a specialized sub-agent with isolated context.
 
         This creates a fresh context for the sub-agent containing only the task description,
         preventing context pollution from the parent agent's conversation history.
+        Only the parent files named in ``files`` are shared with the sub-agent.
         """
         # Validate requested agent type exists
-        if subagent_type not in agents:
-            return f"Error: invoked agent of type {subagent_type}, the only allowed types are {[f'`{k}`' for k in agents]}"
+        if subagent_type not in prompts:
+            return _unknown_agent(subagent_type)
+        if not scheduler.can_delegate():
+            return _too_deep()
 
-        # Get the requested sub-agent
-        sub_agent = agents[subagent_type]
+        # Execute the sub-agent in isolation, within the concurrency limit
+        sub_state, shared = _isolated_state(state, description, files)
 
-        # Create isolated context with only the task description
-        # This is the key to context isolation - no parent history
-        state["messages"] = [{"role": "user", "content": description}]
+        # Reuse the outcome of an identical earlier delegation if cached
+        cache_key = _cache_key(subagent_type, description, shared)
+        if (cached := _cached(cache_key)) is not None:
+            return _to_command(cached, shared, subagent_type, tool_call_id)
 
-        # Execute the sub-agent in isolation
-        result = sub_agent.invoke(state)
+        budget = budget or _configured_budget() or budgets[subagent_type]
+        with scheduler.delegate():
+            if executor is not None:
+                outcome = executor.run(subagent_type, sub_state, budget)
+            else:
+                _announce_delegation(subagent_type, description, tool_call_id)
+                outcome = run_delegation(
+                    _get_agent(subagent_type),
+                    sub_state,
+                    budget,
+                    _delegation_config(subagent_type, tool_call_id),
+                )
 
-        # Return results to parent agent via Command state update
-        return Command(
-            update={
-                "files": result.get("files", {}),  # Merge any file changes
-                "messages": [
-                    # Sub-agent result becomes a ToolMessage in parent context
-                    ToolMessage(
-                        result["messages"][-1].content, tool_call_id=tool_call_id
-                    )
-                ],
-            }
-        )
+        _store(cache_key, outcome)
+        return _to_command(outcome, shared, subagent_type, tool_call_id)
+
+    async def atask(
+        description: str,
+        subagent_type: str,
+        state: Annotated[DeepAgentState, InjectedState],
+        tool_call_id: Annotated[str, InjectedToolCallId],
+        files: list[str] | None = None,
+        budget: Annotated[TaskBudget | None, InjectedToolArg] = None,
+    ):
+        """Delegate a task to a specialized sub-agent with isolated context (async).
+
+        Sibling task calls from one parent turn run concurrently, up to the
+        configured concurrency limit.
+        """
+        # Validate requested agent type exists
+        if subagent_type not in prompts:
+            return _unknown_agent(subagent_type)
+        if not scheduler.can_delegate():
+            return _too_deep()
+
+        # Execute the sub-agent in isolation, within the concurrency limit
+        sub_state, shared = _isolated_state(state, description, files)
+
+        # Reuse the outcome of an identical earlier delegation if cached
+        cache_key = _cache_key(subagent_type, description, shared)
+        if (cached := _cached(cache_key)) is not None:
+            return _to_command(cached, shared, subagent_type, tool_call_id)
+
+        budget = budget or _configured_budget() or budgets[subagent_type]
+        async with scheduler.adelegate():
+            if executor is not None:
+                outcome = await executor.arun(subagent_type, sub_state, budget)
+            else:
+                _announce_delegation(subagent_type, description, tool_call_id)
+                outcome = await arun_delegation(
+                    _get_agent(subagent_type),
+                    sub_state,
+                    budget,
+                    _delegation_config(subagent_type, tool_call_id),
+                )
+
+        _store(cache_key, outcome)
+        return _to_command(outcome, shared, subagent_type, tool_call_id)
 
-    return task
+    task_tool = StructuredTool.from_function(
+        func=task,
+        coroutine=atask,
+        name="task",
+        description=TASK_DESCRIPTION_PREFIX.format(other_agents=other_agents_string),
+    )
+    return task_tool
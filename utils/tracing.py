@@ -0,0 +1,111 @@
+"""Headless JSONL tracing of agent streams.
+
+JsonlTraceWriter records ``(namespace, mode, event)`` tuples from
+``agent.astream(..., subgraphs=True)`` as one compact JSON line each:
+
+    {"ts": 1760000000.123, "ns": ["tools:..."], "mode": "updates", "bytes": 412, "event": {...}}
+
+The agent loop only timestamps and enqueues events. Serialization and file
+writes happen in a background thread, in batches, so tracing can stay on
+without slowing the run.
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+
+_CLOSE = object()
+
+logger = logging.getLogger(__name__)
+
+
+def _jsonable(obj):
+    """json.dumps fallback for messages, pydantic models and other objects."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(exclude_none=True)
+    if isinstance(obj, (set, tuple)):
+        return list(obj)
+    return repr(obj)
+
+
+def _compact_event(mode: str, event):
+    # Token events carry the full run metadata; keep only where they came from
+    if mode == "messages":
+        chunk, metadata = event
+        return {"message": chunk, "node": metadata.get("langgraph_node")}
+    return event
+
+
+class JsonlTraceWriter:
+    """Write stream events as JSONL from a background thread.
+
+    Args:
+        path: File to append trace lines to
+        batch_size: Maximum events serialized and written per file write
+    """
+
+    def __init__(self, path: str, batch_size: int = 256):
+        self.path = path
+        self.batch_size = batch_size
+        self.events_written = 0
+        self.bytes_written = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="jsonl-trace-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, namespace, mode: str, event) -> None:
+        """Queue one stream event; returns immediately."""
+        self._queue.put((time.time(), namespace, mode, event))
+
+    def _serialize(self, item) -> str:
+        ts, namespace, mode, event = item
+        try:
+            body = json.dumps(_compact_event(mode, event), default=_jsonable, separators=(",", ":"))
+        except Exception as e:
+            # Includes events mutated by the agent while queued (e.g. a state
+            # dict edited in place), which fail with RuntimeError mid-iteration
+            body = json.dumps({"error": f"unserializable event: {type(e).__name__}: {e}"})
+        prefix = json.dumps(
+            {"ts": round(ts, 6), "ns": list(namespace), "mode": mode, "bytes": len(body.encode("utf-8"))},
+            separators=(",", ":"),
+        )
+        return f'{prefix[:-1]},"event":{body}}}\n'
+
+    def _run(self) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                items = [self._queue.get()]
+                # Drain whatever else is waiting, up to one batch
+                while len(items) < self.batch_size:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                closing = items[-1] is _CLOSE
+                try:
+                    lines = [self._serialize(item) for item in items if item is not _CLOSE]
+                    if lines:
+                        chunk = "".join(lines)
+                        f.write(chunk)
+                        f.flush()
+                        self.events_written += len(lines)
+                        self.bytes_written += len(chunk.encode("utf-8"))
+                except Exception:
+                    # Drop this batch but keep the thread alive for later events
+                    logger.exception("Failed to write %d trace events to %s", len(items), self.path)
+                if closing:
+                    return
+
+    def close(self) -> None:
+        """Write all queued events and stop the writer thread."""
+        self._queue.put(_CLOSE)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()